@@ -1,5 +1,5 @@
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, jsonify, stream_with_context
 import json
 import os
 import time
@@ -7,16 +7,20 @@ import re
 import random
 from flask_session import Session
 from math import sqrt
-from collections import Counter
+from progress_store import create_progress_store
+from level_catalog import GAME_LEVEL_FILES, LevelCatalog
+from user_history import HistoryCache, LazyHistory
+from user_store import UserRepository
+from solver_cache import SolverCache
+from solution_store import SolutionStore, start_precompute_process
+from solver_service import SolverService, SolveFailed
+from solve_jobs import SolveJobs, create_job_broker
+from maze_analysis import MazeAnalysisCache
+from maze_generator import decode_maze, encoded_maze_size, endless_level, is_encoded_maze, unpack_maze
 
 # Solver Imports
 from number_guessing_solver import solve_number_guessing
-from maze_solver import dfs_solver, bfs_solver, astar_solver, greedy_solver
-from puzzle_solver import solve_puzzle_astar, solve_puzzle_bfs, solve_puzzle_iddfs
-from sudoku_solver import solve_sudoku_dfs, solve_sudoku_astar, solve_sudoku_ac3
-from word_search_solver import solve_word_search_simple, solve_word_search_trie
-from memory_solver import solve_memory_dfs, solve_memory_astar, solve_memory_greedy
-from pattern_lock_solver import solve_pattern_lock_dfs, solve_pattern_lock_bfs, solve_pattern_lock_astar, solve_pattern_lock_greedy
+from solver_registry import SOLVERS, EVENT_STREAMS, FINAL_EVENTS, level_payload
 
 app = Flask(__name__)
 app.secret_key = "supersecretkey"
@@ -29,22 +33,16 @@ ADMIN_PASSWORD = "admin123"
 
 # --- FILE PATH CONSTANTS ---
 PROGRESS_FILE = "user_progress.json"
+PROGRESS_DB = "user_progress.db"
+PROGRESS_BACKEND = os.environ.get("PROGRESS_BACKEND", "sqlite")
+SOLUTIONS_DB = os.environ.get("SOLUTIONS_DB", "level_solutions.db")
+JOB_DB = "solve_jobs.db"
+JOB_BROKER = os.environ.get("JOB_BROKER", "memory")
 USERS_FILE = "users.json"
 EXPLANATIONS_FILE = "explanations.json"
 
 CONFIG_FILE = "game_config.json"
-GAME_LEVEL_FILES = {
-    "maze": "data/maze_levels.json",
-    "puzzle": "data/puzzle_levels.json",
-    "sudoku": "data/sudoku_levels.json",
-    "word_search": "data/word_search_levels.json",
-    "number_guessing": "data/number_guessing_levels.json",
-    "math_quiz": "data/math_quiz_levels.json",
-    "memory": "data/memory_levels.json",
-    "hangman": "data/hangman_levels.json",
-    "pattern_lock": "data/pattern_lock_levels.json"
-}
-
+LEADERBOARD_SIZE = 100
 GAME_NAMES = {
     "maze": "Maze Solver", "puzzle": "Puzzle-8 Solver", "sudoku": "Sudoku",
     "word_search": "Word Search", "number_guessing": "Number Guessing",
@@ -52,6 +50,23 @@ GAME_NAMES = {
     "hangman": "Hangman", "pattern_lock": "Pattern Lock"
 }
 
+# Parsed level files, shared by every level page; reloaded on mtime change or admin save.
+level_catalog = LevelCatalog(GAME_LEVEL_FILES)
+
+# Solver results keyed by (game, algorithm, input); set SOLVER_CACHE_DB to persist them.
+solver_cache = SolverCache(max_entries=int(os.environ.get("SOLVER_CACHE_SIZE", 512)), persist_path=os.environ.get("SOLVER_CACHE_DB"))
+
+# Live solves run in a pool of worker processes with per-algorithm time/node budgets.
+solver_service = SolverService(processes=int(os.environ.get("SOLVER_PROCESSES", 0)) or None)
+
+# Solutions for every shipped level, read from SOLUTIONS_DB. One precompute process fills it at
+# server start (gunicorn.conf.py, or `python solution_store.py`) and after each admin level edit.
+solution_store = SolutionStore(SOLUTIONS_DB)
+PRECOMPUTE_BUDGET = int(os.environ.get("PRECOMPUTE_BUDGET", 120))
+
+# Maze distance fields by maze content, for hints and level analysis without re-searching.
+maze_analysis_cache = MazeAnalysisCache()
+
 # --- UTILITY FUNCTIONS ---
 def load_json(file_path):
     if not os.path.exists(file_path): return {}
@@ -62,29 +77,99 @@ def load_json(file_path):
 def save_json(data, file_path):
     with open(file_path, "w", encoding='utf-8') as f: json.dump(data, f, indent=2)
 
+user_repository = UserRepository(USERS_FILE)
+
+def solve_request(game, algorithm, payload):
+    """Returns (result, cached): a precomputed level solution, a cached result, or a live solve."""
+    result = solution_store.get(game, algorithm, payload)
+    if result is not None: return result, True
+    result = solver_cache.get(game, algorithm, payload)
+    if result is not None: return result, True
+    outcome = solver_service.solve(game, algorithm, payload)
+    if outcome["status"] != "ok": raise SolveFailed(outcome)
+    solver_cache.put(game, algorithm, payload, outcome["result"])
+    return outcome["result"], False
+
+# --- ASYNC SOLVE JOBS ---
+# Route result tuples, by game, as the JSON keys the synchronous routes return.
+RESULT_FIELDS = {
+    "maze": ("solution", "nodes_expanded", "ai_time"), "puzzle": ("solution", "ai_time"), "sudoku": ("solution", "steps", "ai_time"),
+    "word_search": ("found_words", "ai_time"), "memory": ("path", "ai_time"), "pattern_lock": ("solution", "ai_time")
+}
+
+def record_job_progress(job, result):
+    meta = job["meta"]
+    if meta.get("email") and meta.get("level_key") and result[0]:
+        field = f"{job['algorithm'].lower().replace('*', 'star').replace('-', '')}_time"
+        update_user_level(meta["email"], meta["level_key"], **{field: result[-1]})
+
+solve_jobs = SolveJobs(create_job_broker(JOB_BROKER, JOB_DB), lambda game, algorithm, payload: solve_request(game, algorithm, payload)[0],
+                       on_done=record_job_progress, workers=int(os.environ.get("JOB_WORKERS", 2)))
+if JOB_BROKER != "memory": solve_jobs.start()
+
+def job_view(job):
+    view = {k: job[k] for k in ("id", "status", "game", "algorithm", "submitted_at", "started_at", "finished_at", "outcome")}
+    view["attempts"] = job.get("attempts", 0)
+    view["result"] = dict(zip(RESULT_FIELDS[job["game"]], job["result"])) if job["result"] is not None else None
+    return view
+
+def submit_solve_job(game, algorithm, payload, level_key=None):
+    meta = {"email": session["user"]["email"], "level_key": level_key} if session.get("user") and level_key else {}
+    job_id = solve_jobs.submit(game, algorithm, payload, meta)
+    return jsonify({"job_id": job_id, "status": "queued", "status_url": url_for("solve_job_status", job_id=job_id),
+                    "stream_url": url_for("stream_solve_job", job_id=job_id)}), 202
+
+@app.route("/jobs/solve", methods=["POST"])
+def create_solve_job():
+    data = request.json
+    if data.get('algorithm') not in SOLVERS.get(data.get('game'), {}): return jsonify({"status": "error", "message": "Unknown game or algorithm"}), 400
+    if data['game'] == 'maze':
+        error = client_maze_error(data.get('payload'))
+        if error: return jsonify({"status": "error", "message": error}), 400
+    return submit_solve_job(data['game'], data['algorithm'], level_payload(data['game'], data['payload']), data.get('level_key'))
+
+@app.route("/jobs/<string:job_id>")
+def solve_job_status(job_id):
+    job = solve_jobs.status(job_id)
+    if job is None: return jsonify({"status": "error", "message": "Job not found"}), 404
+    return jsonify(job_view(job))
+
+@app.route("/jobs/<string:job_id>/stream")
+def stream_solve_job(job_id):
+    if solve_jobs.status(job_id) is None: return jsonify({"status": "error", "message": "Job not found"}), 404
+    def events():
+        for job in solve_jobs.watch(job_id):
+            if job is None: yield ": keep-alive\n\n"
+            else: yield f"event: {job['status']}\ndata: {json.dumps(job_view(job))}\n\n"
+    return Response(stream_with_context(events()), mimetype="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.errorhandler(SolveFailed)
+def solve_failed(error):
+    outcome = error.outcome
+    response = {"status": outcome["status"], "message": outcome.get("message", ""), "solution": None,
+                "ai_time": f"{outcome['elapsed']:.12f}", "budget": outcome.get("budget"), "partial": outcome.get("partial")}
+    return jsonify(response), 503
+
 def get_user_details():
-    users = load_json(USERS_FILE)
-    return {user['email']: user for user in users} if isinstance(users, list) else {}
+    return user_repository.by_email()
+
+# Progress lives in an indexed store; the legacy JSON file is imported once on first start.
+progress_store = create_progress_store(PROGRESS_BACKEND, PROGRESS_FILE, PROGRESS_DB)
+history_cache = HistoryCache(progress_store, GAME_NAMES)
 
 def update_user_level(email, level_key, **kwargs):
-    progress = load_json(PROGRESS_FILE)
-    user_data = progress.get(email, {})
-    level_data = user_data.get(level_key, {})
-    level_data.update(kwargs)
-    user_data[level_key] = level_data
-    progress[email] = user_data
-    save_json(progress, PROGRESS_FILE)
+    level_data = progress_store.update_level(email, level_key, **kwargs)
+    history_cache.record(email, level_key, level_data)
 
 @app.route("/admin/user/<email>")
 def admin_user_details(email):
     user = session.get("user")
     if not user or user["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
 
-    all_users = load_json(USERS_FILE)
-    target_user = next((u for u in all_users if u['email'] == email), None)
+    target_user = user_repository.get(email)
     if not target_user: return "User not found", 404
 
-    progress = load_json(PROGRESS_FILE).get(email, {})    
+    progress = progress_store.get_user(email)
     progress_details = []
     for level_key, data in progress.items():
         try:
@@ -102,32 +187,23 @@ def admin_dashboard():
     user = session.get("user")
     if not user or user["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
     
-    users, progress = load_json(USERS_FILE), load_json(PROGRESS_FILE)
-    
+    users = [dict(u) for u in user_repository.all()]
+    play_counts, progress_details = progress_store.play_counts(), {}
+    for email, level_key, game, diff, level in progress_store.played_levels():
+        if not game: continue
+        progress_details.setdefault(email, []).append({
+            "key": level_key, "game": GAME_NAMES.get(game, game.replace('_', ' ').title()),
+            "level": f"{diff.title()} {level}"})
+
     # Add games_played count to each user
     for u in users:
-        user_progress = progress.get(u['email'], {})
-        u['games_played'] = len(user_progress)
-        u['progress_details'] = []
-        for level_key, data in user_progress.items():
-            try:
-                game, diff, level = re.match(r"([a-z_]+)_(\w+)-(\d+)", level_key).groups()
-                u['progress_details'].append({
-                    "key": level_key, "game": GAME_NAMES.get(game, game.replace('_', ' ').title()),
-                    "level": f"{diff.title()} {level}"})
-            except (AttributeError, IndexError, ValueError): continue
+        u['games_played'] = play_counts.get(u['email'], 0)
+        u['progress_details'] = progress_details.get(u['email'], [])
 
-    game_counts, total_plays = Counter(), 0
-    for user_progress in progress.values():
-        total_plays += len(user_progress)
-        for level_key in user_progress:
-            match = re.match(r"([a-z_]+)_(\w+)-(\d+)", level_key)
-            if match: game_counts[match.groups()[0]] += 1
-
-
-    most_played_key = game_counts.most_common(1)[0][0] if game_counts else "N/A"
+    game_counts = progress_store.game_counts()
+    most_played_key = max(game_counts, key=game_counts.get) if game_counts else "N/A"
     stats = {
-        "total_users": len(users), "total_plays": total_plays,
+        "total_users": len(users), "total_plays": progress_store.total_plays(),
         "most_played_game": GAME_NAMES.get(most_played_key, "N/A"),
         "game_popularity": {GAME_NAMES.get(k, k): v for k, v in game_counts.items()}
     }
@@ -141,36 +217,29 @@ def admin_games():
 @app.route("/admin/delete_user/<email>")
 def admin_delete_user(email):
     if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
-    save_json([u for u in load_json(USERS_FILE) if u['email'] != email], USERS_FILE)
-    progress = load_json(PROGRESS_FILE)
-    if email in progress:
-        del progress[email]
-        save_json(progress, PROGRESS_FILE)
+    user_repository.delete(email)
+    progress_store.delete_user(email)
+    history_cache.forget(email)
     return redirect(url_for('admin_dashboard'))
 
 @app.route("/admin/delete_progress/<email>/<level_key>")
 def admin_delete_progress(email, level_key):
     if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
-    progress = load_json(PROGRESS_FILE)
-    if email in progress and level_key in progress[email]:
-        del progress[email][level_key]
-        if not progress[email]: del progress[email]
-        save_json(progress, PROGRESS_FILE)
+    progress_store.delete_level(email, level_key)
+    history_cache.forget(email, level_key)
     return redirect(url_for('admin_dashboard'))
 
 @app.route("/admin/levels/<game_name>")
 def admin_edit_level_list(game_name):
     if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
-    file_path = GAME_LEVEL_FILES.get(game_name)
-    if not file_path: return "Game not found", 404
-    return render_template("admin_level_selection.html", game_name=game_name, levels=load_json(file_path))
+    if game_name not in GAME_LEVEL_FILES: return "Game not found", 404
+    return render_template("admin_level_selection.html", game_name=game_name, levels=level_catalog.levels(game_name))
 
 @app.route("/admin/edit_level/<game_name>/<difficulty>/<level>")
 def admin_edit_level(game_name, difficulty, level):
     if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
-    file_path = GAME_LEVEL_FILES.get(game_name)
-    if not file_path: return "Game not found", 404
-    level_data = load_json(file_path).get(difficulty, {}).get(level)
+    if game_name not in GAME_LEVEL_FILES: return "Game not found", 404
+    level_data = level_catalog.get_level(game_name, difficulty, level)
     if level_data is None: return "Level not found", 404
     return render_template("admin_level_editor.html", game_name=game_name, difficulty=difficulty, level=level, level_data=level_data)
 
@@ -184,9 +253,25 @@ def admin_save_level():
     if req['difficulty'] in levels and req['level'] in levels[req['difficulty']]:
         levels[req['difficulty']][req['level']] = req['data']
         save_json(levels, file_path)
+        level_catalog.invalidate(req['game_name'])
+        solver_cache.invalidate(req['game_name'])
+        solution_store.discard_level(req['game_name'], req['difficulty'], req['level'])
+        if req['game_name'] in SOLVERS:
+            start_precompute_process(SOLUTIONS_DB, budget=PRECOMPUTE_BUDGET, game=req['game_name'], difficulty=req['difficulty'], level=req['level'])
         return jsonify({"status": "success"})
     return jsonify({"status": "error", "message": "Level not found"}), 404
 
+@app.route("/admin/cache_stats")
+def admin_cache_stats():
+    if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return jsonify({"status": "error", "message": "Unauthorized"}), 403
+    return jsonify({"level_catalog": level_catalog.stats(), "solver_cache": solver_cache.stats(), "solution_store": solution_store.stats(), "solver_service": solver_service.stats(),
+                    "maze_analysis": maze_analysis_cache.stats()})
+
+@app.route("/admin/maze_analysis")
+def admin_maze_analysis():
+    if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return jsonify({"status": "error", "message": "Unauthorized"}), 403
+    return jsonify(maze_analysis_cache.analyze_levels(level_catalog.levels('maze')))
+
 @app.route("/admin/explanations", methods=["GET", "POST"])
 def admin_edit_explanations():
     if not session.get("user") or session["user"]["email"] != ADMIN_EMAIL: return redirect(url_for("login"))
@@ -259,15 +344,22 @@ def explanation_page(): return render_template("explanation.html")
 
 @app.route("/leaderboard")
 def leaderboard():
-    progress_data, user_details = load_json(PROGRESS_FILE), get_user_details()
+    user_details = get_user_details()
     data = []
-    for email, p in progress_data.items():
-        if not p: continue
+    for email, total_games_played in progress_store.top_players(LEADERBOARD_SIZE):
         user_info = user_details.get(email, {})
-        total_games_played = len(p)
-        data.append({"name": user_info.get('name', 'Unknown'), "username": user_info.get('username', 'unknown'), "progress": p, "total_games_played": total_games_played})
+        data.append({"name": user_info.get('name', 'Unknown'), "username": user_info.get('username', 'unknown'), "total_games_played": total_games_played})
     return render_template("leaderboard.html", data=data, active_page="leaderboard")
 
+@app.route("/api/leaderboard/<string:level_key>")
+def level_leaderboard(level_key):
+    user_details = get_user_details()
+    data = []
+    for email, level_data in progress_store.level_progress(level_key).items():
+        user_info = user_details.get(email, {})
+        data.append({"name": user_info.get('name', 'Unknown'), "username": user_info.get('username', 'unknown'), "data": level_data})
+    return jsonify(data)
+
 @app.route("/login", methods=["GET", "POST"])
 def login():
     if request.method == "POST":
@@ -275,10 +367,9 @@ def login():
         if email == ADMIN_EMAIL and password == ADMIN_PASSWORD:
             session["user"] = {"name": "Admin", "email": ADMIN_EMAIL}
             return redirect(url_for("admin_dashboard"))
-        users = load_json(USERS_FILE)
-        user = next((u for u in users if u["email"].lower() == email.lower() and u["password"] == password), None)
+        user = user_repository.authenticate(email, password)
         if user:
-            session["user"] = user
+            session["user"] = dict(user)
             return redirect(url_for("home"))
         return render_template("login.html", error="Invalid credentials.")
     return render_template("login.html")
@@ -292,16 +383,10 @@ def logout():
 def edit_profile():
     if "user" not in session: return redirect(url_for("login"))
     if request.method == "POST":
-        users = load_json(USERS_FILE)
-        for u in users:
-            if u["email"] == session["user"]["email"]:
-                u["name"] = request.form["name"]
-                u["username"] = request.form["username"]
-                u["gender"] = request.form["gender"]
-                if request.form.get("password"): u["password"] = request.form["password"]
-                session["user"] = u
-                break
-        save_json(users, USERS_FILE)
+        fields = {"name": request.form["name"], "username": request.form["username"], "gender": request.form["gender"]}
+        if request.form.get("password"): fields["password"] = request.form["password"]
+        u = user_repository.update(session["user"]["email"], **fields)
+        if u: session["user"] = dict(u)
         return redirect(url_for("home"))
     return render_template("edit_profile.html")
 
@@ -321,8 +406,10 @@ def ai_animation():
     # Get query params for preselecting game and algo
     game = request.args.get("game", "maze")
     algo = request.args.get("algo", "bfs")
+    # Sudoku explanations can replay a live search on a shipped board (?difficulty=&level=).
+    board = level_catalog.get_level('sudoku', request.args.get("difficulty", "easy"), request.args.get("level", 1)) if game == "sudoku" else None
     # Pass to template for JS to use
-    return render_template("ai_animation.html", game=game, algo=algo)
+    return render_template("ai_animation.html", game=game, algo=algo, board=board)
 
 # --- GAME-SPECIFIC ROUTES ---
 
@@ -332,22 +419,58 @@ def maze_solver(): return render_template("maze_solver.html", active_page="games
 @app.route("/maze_solver/levels")
 def show_maze_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
+def load_maze_level(difficulty, level):
+    """A shipped level from the catalog, or an "endless" level generated from its number; None if neither."""
+    if difficulty == "endless": return endless_level(level) if level >= 1 else None
+    return level_catalog.get_level('maze', difficulty, level)
 @app.route("/level/maze/<string:difficulty>/<int:level>")
 def play_maze_level(difficulty, level):
-    maze = load_json(GAME_LEVEL_FILES['maze']).get(difficulty, {}).get(str(level))
+    maze = load_maze_level(difficulty, level)
     if not maze: return "Maze level not found!", 404
-    return render_template("level_maze.html", maze=maze, difficulty=difficulty, level=level, rows=len(maze), cols=len(maze[0]))
+    # Endless levels are sent to the solvers in their compact encoded form.
+    maze_code = maze if difficulty == "endless" else None
+    if maze_code: maze = decode_maze(maze_code)
+    return render_template("level_maze.html", maze=maze, maze_code=maze_code, difficulty=difficulty, level=level, rows=len(maze), cols=len(maze[0]))
+# Client-supplied mazes are bounded before they reach a solver process; the solvers themselves take any size.
+MAX_CLIENT_MAZE_SIDE = 1001
+
+def client_maze_error(maze):
+    """Why a maze sent by a client can't be solved, or None if it can."""
+    try:
+        if is_encoded_maze(maze): rows, cols = encoded_maze_size(maze)
+        elif isinstance(maze, list) and maze and all(isinstance(row, list) and row and len(row) == len(maze[0]) for row in maze):
+            rows, cols = len(maze), len(maze[0])
+        else: return "A maze must be an encoded maze or a non-empty list of equal-length rows"
+        if rows > MAX_CLIENT_MAZE_SIDE or cols > MAX_CLIENT_MAZE_SIDE:
+            return f"Mazes are limited to {MAX_CLIENT_MAZE_SIDE}x{MAX_CLIENT_MAZE_SIDE}, got {rows}x{cols}"
+        if is_encoded_maze(maze): unpack_maze(maze)
+    except ValueError as exc:
+        return str(exc)
+    return None
+
+@app.route("/api/maze/<string:difficulty>/<int:level>/hint")
+def maze_hint(difficulty, level):
+    maze = load_maze_level(difficulty, level)
+    if not maze: return jsonify({"status": "error", "message": "Maze level not found"}), 404
+    analysis = maze_analysis_cache.get(maze)
+    try:
+        r, c = int(request.args.get("r", 0)), int(request.args.get("c", 0))
+    except ValueError:
+        r = c = -1
+    if not (0 <= r < analysis.rows and 0 <= c < analysis.cols):
+        return jsonify({"status": "error", "message": f"r and c must be a cell of the {analysis.rows}x{analysis.cols} maze"}), 400
+    return jsonify({"distance": analysis.distance(r, c), "reachable": analysis.reachable(r, c),
+                    "next": analysis.next_step(r, c), "path": analysis.path_from(r, c) if request.args.get("path") else None})
 @app.route("/solve_maze", methods=["POST"])
 def solve_maze_route():
     data = request.json
-    solvers = {"DFS": dfs_solver, "BFS": bfs_solver, "A*": astar_solver, "Greedy": greedy_solver}
-    start = time.perf_counter()
-    solution = solvers[data['algorithm']](data['maze'])
-    ai_time = time.perf_counter() - start
+    error = client_maze_error(data.get('maze'))
+    if error: return jsonify({"status": "error", "message": error}), 400
+    (solution, nodes_expanded, ai_time), cached = solve_request("maze", data['algorithm'], data['maze'])
     if session.get("user") and solution:
-        update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('*', 'star')}_time": f"{ai_time:.12f}"})
-    return jsonify({"solution": solution, "ai_time": f"{ai_time:.12f}"})
+        update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('*', 'star').replace('-', '')}_time": ai_time})
+    return jsonify({"solution": solution, "nodes_expanded": nodes_expanded, "ai_time": ai_time, "cached": cached})
 
 # Puzzle
 @app.route('/puzzle')
@@ -355,19 +478,19 @@ def puzzle_page(): return render_template('puzzle_solver.html', active_page='gam
 @app.route('/puzzle/levels')
 def show_puzzle_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_puzzle_levels.html", levels=load_json(GAME_LEVEL_FILES['puzzle']), progress=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_puzzle_levels.html", levels=level_catalog.levels('puzzle'), progress=progress_store.get_user(session["user"]["email"]))
 @app.route('/level/puzzle/<string:difficulty>/<int:level>', methods=['GET', 'POST'])
 def play_puzzle_level(difficulty, level):
-    level_key, all_puzzles = f"puzzle_{difficulty}-{level}", load_json(GAME_LEVEL_FILES['puzzle'])
-    initial_state = all_puzzles.get(difficulty, {}).get(str(level))
+    level_key = f"puzzle_{difficulty}-{level}"
+    initial_state = level_catalog.get_level('puzzle', difficulty, level)
     if not initial_state: return "Puzzle level not found!", 404
     if request.method == 'POST':
         data = request.get_json()
-        solvers = {'BFS': solve_puzzle_bfs, 'IDDFS': solve_puzzle_iddfs, 'A*': solve_puzzle_astar}
-        solution, ai_time = solvers[data['algorithm']](data['initial_state'])
+        if data.get('async'): return submit_solve_job("puzzle", data['algorithm'], data['initial_state'], level_key)
+        (solution, ai_time), cached = solve_request("puzzle", data['algorithm'], data['initial_state'])
         if session.get("user") and solution:
             update_user_level(session["user"]["email"], level_key, **{f"{data['algorithm'].lower().replace('*','star')}_time": ai_time})
-        return jsonify({'solution': solution, 'ai_time': ai_time})
+        return jsonify({'solution': solution, 'ai_time': ai_time, 'cached': cached})
     return render_template('level_puzzle.html', difficulty=difficulty, level=level, initial_state=initial_state, grid_size=int(sqrt(len(initial_state))), next_level=level + 1 if level < 5 else None)
 
 # Sudoku
@@ -376,20 +499,50 @@ def sudoku_page(): return render_template("sudoku_solver.html", active_page="gam
 @app.route("/sudoku/levels")
 def show_sudoku_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_sudoku_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_sudoku_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/sudoku/<string:difficulty>/<int:level>")
 def play_sudoku_level(difficulty, level):
-    board = load_json(GAME_LEVEL_FILES['sudoku']).get(difficulty, {}).get(str(level))
+    board = level_catalog.get_level('sudoku', difficulty, level)
     if not board: return "Sudoku level not found!", 404
     return render_template("level_sudoku.html", difficulty=difficulty, level=level, board=board)
 @app.route("/solve_sudoku", methods=["POST"])
 def solve_sudoku_route():
     data = request.json
-    solvers = {"DFS": solve_sudoku_dfs, "A*": solve_sudoku_astar, "AC-3": solve_sudoku_ac3}
-    solution, steps, ai_time = solvers[data['algorithm']](data['board'])
+    if data.get('async'): return submit_solve_job("sudoku", data['algorithm'], data['board'], data.get('level_key'))
+    (solution, steps, ai_time), cached = solve_request("sudoku", data['algorithm'], data['board'])
     if session.get("user") and solution:
         update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('*', 'star').replace('-','')}_time": ai_time})
-    return jsonify({"solution": solution, "steps": steps, "ai_time": ai_time})
+    return jsonify({"solution": solution, "steps": steps, "ai_time": ai_time, "cached": cached})
+
+# Search-event streams for replaying a solve as it runs (NDJSON by default, or SSE).
+# The search runs in a solver process; this worker only relays its event batches.
+@app.route("/stream_solve/sudoku", methods=["POST"])
+def stream_sudoku_solve():
+    data = request.json
+    algorithm = data.get('algorithm')
+    if ("sudoku", algorithm) not in EVENT_STREAMS: return jsonify({"status": "error", "message": "Algorithm does not support streaming"}), 400
+    try:
+        every = int(data.get('every', 1))
+    except (TypeError, ValueError):
+        every = 0
+    types = data.get('types') or []
+    if every < 1 or not isinstance(types, list) or not all(isinstance(t, str) for t in types):
+        return jsonify({"status": "error", "message": "'every' must be a positive integer and 'types' a list of event types"}), 400
+    as_sse = data.get('format') == 'sse'
+    email = session["user"]["email"] if session.get("user") else None
+
+    def frames():
+        start = time.perf_counter()
+        for event in solver_service.stream("sudoku", algorithm, data['board'], every=every, types=set(types)):
+            if event["type"] in FINAL_EVENTS:
+                event = {**event, "ai_time": f"{time.perf_counter() - start:.12f}"}
+                if event["type"] == "solved" and email and data.get('level_key'):
+                    update_user_level(email, data['level_key'], **{f"{algorithm.lower().replace('-', '')}_time": event["ai_time"]})
+            body = json.dumps(event)
+            yield f"event: {event['type']}\ndata: {body}\n\n" if as_sse else body + "\n"
+
+    mimetype = "text/event-stream" if as_sse else "application/x-ndjson"
+    return Response(stream_with_context(frames()), mimetype=mimetype, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 # Word Search
 @app.route("/word_search")
@@ -397,20 +550,19 @@ def word_search_page(): return render_template("word_search_solver.html", active
 @app.route("/word_search/levels")
 def show_word_search_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_word_search_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_word_search_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/word_search/<string:difficulty>/<int:level>")
 def play_word_search_level(difficulty, level):
-    level_data = load_json(GAME_LEVEL_FILES['word_search']).get(difficulty, {}).get(str(level))
+    level_data = level_catalog.get_level('word_search', difficulty, level)
     if not level_data: return "Word Search level not found!", 404
     return render_template("level_word_search.html", difficulty=difficulty, level=level, level_data=level_data)
 @app.route("/solve_word_search", methods=["POST"])
 def solve_word_search_route():
     data = request.json
-    solvers = {"Simple": solve_word_search_simple, "Trie": solve_word_search_trie}
-    found, ai_time = solvers[data['algorithm']](data['grid'], data['words'])
+    (found, ai_time), cached = solve_request("word_search", data['algorithm'], {"grid": data['grid'], "words": sorted(data['words'])})
     if session.get("user") and found:
-        update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower()}_time": ai_time})
-    return jsonify({"found_words": found, "ai_time": ai_time})
+        update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('-', '')}_time": ai_time})
+    return jsonify({"found_words": found, "ai_time": ai_time, "cached": cached})
 
 # Number Guessing
 @app.route("/number_guessing")
@@ -418,10 +570,10 @@ def number_guessing_page(): return render_template("number_guessing_solver.html"
 @app.route("/number_guessing/levels")
 def show_number_guessing_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_number_guessing_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_number_guessing_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/number_guessing/<string:difficulty>/<int:level>")
 def play_number_guessing_level(difficulty, level):
-    level_data = load_json(GAME_LEVEL_FILES['number_guessing']).get(difficulty, {}).get(str(level))
+    level_data = level_catalog.get_level('number_guessing', difficulty, level)
     if not level_data: return "Number Guessing level not found!", 404
     return render_template("level_number_guessing.html", difficulty=difficulty, level=level, level_data=level_data)
 @app.route("/solve_number_guessing", methods=["POST"])
@@ -439,21 +591,20 @@ def memory_page(): return render_template("memory_solver.html", active_page="gam
 @app.route("/memory/levels")
 def show_memory_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_memory_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_memory_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/memory/<string:difficulty>/<int:level>")
 def play_memory_level(difficulty, level):
-    level_data = load_json(GAME_LEVEL_FILES['memory']).get(difficulty, {}).get(str(level), [])
+    level_data = list(level_catalog.get_level('memory', difficulty, level, []))
     random.shuffle(level_data)
     cols = 4 if len(level_data) <= 16 else 6
     return render_template("level_memory.html", difficulty=difficulty, level=level, board=level_data, cols=cols)
 @app.route("/solve_memory", methods=["POST"])
 def solve_memory_route():
     data = request.json
-    solvers = {"DFS": solve_memory_dfs, "A*": solve_memory_astar, "Greedy": solve_memory_greedy}
-    path, ai_time = solvers[data['algorithm']](data['board'])
+    (path, ai_time), cached = solve_request("memory", data['algorithm'], data['board'])
     if session.get("user") and path:
         update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('*', 'star')}_time": ai_time, f"{data['algorithm'].lower().replace('*', 'star')}_moves": len(path) // 2})
-    return jsonify({"path": path, "ai_time": ai_time, "moves": len(path) // 2})
+    return jsonify({"path": path, "ai_time": ai_time, "moves": len(path) // 2, "cached": cached})
 
 # Math Quiz
 @app.route("/math_quiz")
@@ -461,10 +612,10 @@ def math_quiz_page(): return render_template("math_quiz.html", active_page="game
 @app.route("/math_quiz/levels")
 def show_math_quiz_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_math_quiz_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_math_quiz_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/math_quiz/<string:difficulty>/<int:level>")
 def play_math_quiz_level(difficulty, level):
-    level_data = load_json(GAME_LEVEL_FILES['math_quiz']).get(difficulty, {}).get(str(level))
+    level_data = level_catalog.get_level('math_quiz', difficulty, level)
     if not level_data: return "Math Quiz level not found!", 404
     next_level = level + 1 if level < 5 else None
     return render_template("level_math_quiz.html", difficulty=difficulty, level=level, level_data=level_data, next_level_data={'difficulty': difficulty, 'level': next_level} if next_level else None)
@@ -475,10 +626,10 @@ def hangman_page(): return render_template("hangman.html", active_page="games")
 @app.route("/hangman/levels")
 def show_hangman_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_hangman_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_hangman_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/hangman/<string:difficulty>/<int:level>")
 def play_hangman_level(difficulty, level):
-    level_data = load_json(GAME_LEVEL_FILES['hangman']).get(difficulty, {}).get(str(level))
+    level_data = level_catalog.get_level('hangman', difficulty, level)
     if not level_data: return "Hangman level not found!", 404
     return render_template("level_hangman.html", difficulty=difficulty, level=level, level_data=level_data)
 
@@ -488,39 +639,29 @@ def pattern_lock_page(): return render_template("pattern_lock.html", active_page
 @app.route("/pattern_lock/levels")
 def show_pattern_lock_levels():
     if not session.get("user"): return redirect(url_for("login"))
-    return render_template("show_pattern_lock_levels.html", played_levels=load_json(PROGRESS_FILE).get(session["user"]["email"], {}))
+    return render_template("show_pattern_lock_levels.html", played_levels=progress_store.get_user(session["user"]["email"]))
 @app.route("/level/pattern_lock/<string:difficulty>/<int:level>")
 def play_pattern_lock_level(difficulty, level):
-    pattern = load_json(GAME_LEVEL_FILES['pattern_lock']).get(difficulty, {}).get(str(level))
+    pattern = level_catalog.get_level('pattern_lock', difficulty, level)
     if not pattern: return "Pattern Lock level not found!", 404
     return render_template("level_pattern_lock.html", difficulty=difficulty, level=level, pattern=pattern)
 @app.route("/solve_pattern_lock", methods=["POST"])
 def solve_pattern_lock_route():
     data = request.json
-    solvers = {"DFS": solve_pattern_lock_dfs, "BFS": solve_pattern_lock_bfs, "A*": solve_pattern_lock_astar, "Greedy": solve_pattern_lock_greedy}
-    solution, ai_time = solvers[data['algorithm']](data['pattern'])
+    (solution, ai_time), cached = solve_request("pattern_lock", data['algorithm'], data['pattern'])
     if session.get("user") and solution:
         update_user_level(session["user"]["email"], data['level_key'], **{f"{data['algorithm'].lower().replace('*', 'star')}_time": ai_time})
-    return jsonify({"solution": solution, "ai_time": f"{ai_time:.12f}"})
+    return jsonify({"solution": solution, "ai_time": f"{ai_time:.12f}", "cached": cached})
 
 # --- CONTEXT PROCESSOR ---
 @app.context_processor
 def inject_user_and_history():
     user = session.get("user")
-    history = []
-    if user:
-        user_progress = load_json(PROGRESS_FILE).get(user.get("email"), {})
-        for key, data in user_progress.items():
-            try:
-                game, diff, level = re.match(r"([a-z_]+)_(\w+)-(\d+)", key).groups()
-                history.append({
-                    "game": GAME_NAMES.get(game, game.replace('_', ' ').title()),
-                    "level": f"{diff.title()} {level}", "difficulty": diff,
-                    "is_won": not ('status' in data and data['status'] != 'won')
-                })
-            except (AttributeError, IndexError, ValueError): continue
-        history.sort(key=lambda item: item['game'])
+    history = LazyHistory(history_cache, user.get("email")) if user else []
     return dict(user=user, history=history)
 
 if __name__ == "__main__":
+    # The debug reloader re-runs this module in a child with WERKZEUG_RUN_MAIN set; precompute once, from the parent.
+    if os.environ.get("PRECOMPUTE_SOLUTIONS", "1") == "1" and not os.environ.get("WERKZEUG_RUN_MAIN"):
+        start_precompute_process(SOLUTIONS_DB, budget=PRECOMPUTE_BUDGET)
     app.run(debug=True)
@@ -0,0 +1,83 @@
+"""
+Times the maze solvers on generated grids of increasing size, to check that each
+one scales linearly with the number of cells. Run from the repository root:
+
+    python benchmarks/maze_benchmark.py --sizes 250 500 1000 --algorithms DFS BFS
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maze_generator import generate_maze
+from maze_solver import astar_solver, bfs_solver, bidirectional_bfs_solver, dfs_solver, greedy_solver, jps_solver
+
+SOLVERS = {"DFS": dfs_solver, "BFS": bfs_solver, "A*": astar_solver, "Greedy": greedy_solver,
+           "Bi-BFS": bidirectional_bfs_solver, "JPS": jps_solver}
+
+def serpentine_maze(n):
+    """One corridor snaking through every other row: the whole grid is a single path."""
+    maze = [[0] * n if r % 2 == 0 else [1] * n for r in range(n)]
+    for r in range(1, n, 2):
+        maze[r][n - 1 if r % 4 == 1 else 0] = 0
+    maze[n - 1] = [0] * n
+    return maze
+
+def random_maze(n, density=0.3, seed=0):
+    rng = random.Random(seed)
+    maze = [[1 if rng.random() < density else 0 for _ in range(n)] for _ in range(n)]
+    maze[0][0] = maze[n - 1][n - 1] = 0
+    return maze
+
+def open_maze(n):
+    return [[0] * n for _ in range(n)]
+
+def rooms_maze(n, room=25):
+    """Open rooms separated by walls with one doorway per wall segment: the layout JPS is meant for."""
+    rng = random.Random(n)
+    maze = [[0] * n for _ in range(n)]
+    walls = range(room, n, room)
+    for w in walls:
+        for i in range(n):
+            maze[w][i] = maze[i][w] = 1
+    for w in walls:
+        for lo in range(0, n, room):
+            hi = min(lo + room, n)
+            if hi - lo > 1:
+                maze[w][rng.randrange(lo + 1, hi)] = 0
+                maze[rng.randrange(lo + 1, hi)][w] = 0
+    maze[n - 1][n - 1] = 0
+    return maze
+
+def backtracker_maze(n):
+    return generate_maze(n | 1, n | 1, "backtracker", seed=n)
+
+def kruskal_maze(n):
+    return generate_maze(n | 1, n | 1, "kruskal", seed=n)
+
+MAZES = {"serpentine": serpentine_maze, "random": random_maze, "open": open_maze, "rooms": rooms_maze,
+         "backtracker": backtracker_maze, "kruskal": kruskal_maze}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000])
+    parser.add_argument("--algorithms", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--mazes", nargs="+", default=list(MAZES), choices=list(MAZES))
+    args = parser.parse_args()
+
+    print(f"{'maze':<12}{'size':>11}{'algorithm':>11}{'seconds':>10}{'ns/cell':>10}{'path':>10}{'expanded':>10}")
+    for maze_name in args.mazes:
+        for n in args.sizes:
+            maze = MAZES[maze_name](n)
+            for algorithm in args.algorithms:
+                stats = {}
+                started = time.perf_counter()
+                path = SOLVERS[algorithm](maze, stats=stats)
+                elapsed = time.perf_counter() - started
+                print(f"{maze_name:<12}{f'{n}x{n}':>11}{algorithm:>11}{elapsed:>10.3f}{elapsed / (n * n) * 1e9:>10.0f}{len(path):>10}{stats['nodes']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Times the parallel Aho-Corasick word search against its serial scan on a large
+random grid with a dictionary-sized word list, one row per process count, and
+checks every run finds the same words. Run from the repository root:
+
+    python benchmarks/word_search_benchmark.py --size 1000 --words 20000 --processes 1 2 4 8
+
+Scaling is only meaningful up to the machine's CPU count, which is printed first;
+rows with more processes than CPUs are marked. No multi-core results have been
+recorded yet: on a single core (600x600, 10k words) every process count ran in
+1.9-2.1s against 2.4s serial, i.e. no speedup.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_search_solver import DIRECTIONS, build_automaton, solve_word_search_aho, solve_word_search_parallel
+
+def random_puzzle(n, word_count, seed=0):
+    """An n x n grid of random letters with a quarter of the words written into it in random directions."""
+    rng = random.Random(seed)
+    letters = string.ascii_uppercase
+    grid = [[rng.choice(letters) for _ in range(n)] for _ in range(n)]
+    words = list({"".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(word_count)})
+    for word in words[: len(words) // 4]:
+        dr, dc = rng.choice(DIRECTIONS)
+        r = rng.randrange(n) if dr == 0 else (rng.randrange(n - len(word)) if dr > 0 else rng.randrange(len(word), n))
+        c = rng.randrange(n) if dc == 0 else (rng.randrange(n - len(word)) if dc > 0 else rng.randrange(len(word), n))
+        for i, char in enumerate(word):
+            grid[r + i * dr][c + i * dc] = char
+    return grid, words
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--processes", type=int, nargs="+", default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    grid, words = random_puzzle(args.size, args.words)
+    started = time.perf_counter()
+    build_automaton(tuple(sorted(set(words))))
+    cpus = os.cpu_count() or 1
+    print(f"{args.size}x{args.size} grid, {len(words)} words, automaton built in {time.perf_counter() - started:.3f}s, {cpus} CPUs")
+
+    found, serial = solve_word_search_aho(grid, words)
+    print(f"{'mode':<10}{'processes':>10}{'seconds':>10}{'speedup':>10}{'found':>10}{'same':>6}")
+    print(f"{'serial':<10}{1:>10}{float(serial):>10.3f}{1.0:>10.2f}{len(found):>10}{'yes':>6}")
+    for processes in args.processes:
+        result, elapsed = solve_word_search_parallel(grid, words, processes=processes, min_cells=0)
+        same = "yes" if result == found else "NO"
+        note = "  (more processes than CPUs)" if processes > cpus else ""
+        print(f"{'parallel':<10}{processes:>10}{float(elapsed):>10.3f}{float(serial) / float(elapsed):>10.2f}{len(result):>10}{same:>6}{note}")
+
+if __name__ == "__main__":
+    main()
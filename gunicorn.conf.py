@@ -0,0 +1,8 @@
+import os
+
+from solution_store import start_precompute_process
+
+def on_starting(server):
+    """Fills the level solution store once per deployment, before any worker is forked."""
+    if os.environ.get("PRECOMPUTE_SOLUTIONS", "1") == "1":
+        start_precompute_process(os.environ.get("SOLUTIONS_DB", "level_solutions.db"), budget=int(os.environ.get("PRECOMPUTE_BUDGET", 120)))
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+
+GAME_LEVEL_FILES = {
+    "maze": "data/maze_levels.json",
+    "puzzle": "data/puzzle_levels.json",
+    "sudoku": "data/sudoku_levels.json",
+    "word_search": "data/word_search_levels.json",
+    "number_guessing": "data/number_guessing_levels.json",
+    "math_quiz": "data/math_quiz_levels.json",
+    "memory": "data/memory_levels.json",
+    "hangman": "data/hangman_levels.json",
+    "pattern_lock": "data/pattern_lock_levels.json"
+}
+
+class LevelCatalog:
+    """
+    Parses each data/*_levels.json file once and serves level lookups from memory.
+    An entry is reparsed when the file's mtime/size changes (e.g. another worker
+    saved it) or when invalidate() is called after an admin edit.
+    Returned objects are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, level_files):
+        self.level_files = level_files
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _signature(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    @staticmethod
+    def _parse(file_path):
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f: return json.load(f)
+        except (json.JSONDecodeError, OSError): return {}
+
+    def levels(self, game):
+        """Returns the whole {difficulty: {level: data}} map for a game ({} if unknown)."""
+        file_path = self.level_files.get(game)
+        if not file_path: return {}
+        signature = self._signature(file_path)
+        entry = self._entries.get(game)
+        if entry is not None and entry[0] == signature and signature is not None:
+            self.hits += 1
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(game)
+            if entry is not None and entry[0] == signature and signature is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            levels = self._parse(file_path) if signature is not None else {}
+            self._entries[game] = (signature, levels)
+            return levels
+
+    def get_level(self, game, difficulty, level, default=None):
+        return self.levels(game).get(difficulty, {}).get(str(level), default)
+
+    def invalidate(self, game=None):
+        with self._lock:
+            if game is None: self._entries.clear()
+            else: self._entries.pop(game, None)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached_games": sorted(self._entries)}
@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from maze_generator import is_encoded_maze, unpack_maze
+
+# Down, right, up, left: the same move order as the maze solvers.
+MOVES = ((1, 0), (0, 1), (-1, 0), (0, -1))
+WALL, UNREACHED = -2, -1
+
+def distance_field(maze, target=None):
+    """
+    BFS distance from every cell of `maze` (a list of rows or an encoded maze) to
+    `target` (default: the bottom-right goal), by vectorized wavefront expansion.
+    The grid is padded with a wall border and flattened, so one step is a fixed
+    index offset and each wave is a handful of array operations over the frontier.
+    Walls are WALL and unreachable cells are UNREACHED in the returned (rows, cols)
+    int32 array.
+    """
+    grid = unpack_maze(maze) if is_encoded_maze(maze) else np.asarray(maze, dtype=np.int8)
+    rows, cols = grid.shape
+    target = (rows - 1, cols - 1) if target is None else tuple(target)
+    width = cols + 2
+    dist = np.full((rows + 2) * width, WALL, dtype=np.int32)
+    interior = dist.reshape(rows + 2, width)[1:-1, 1:-1]
+    interior[grid == 0] = UNREACHED
+    offsets = np.array([dr * width + dc for dr, dc in MOVES], dtype=np.int64)
+
+    source = (target[0] + 1) * width + target[1] + 1
+    if dist[source] == WALL: return interior.copy()
+    dist[source], frontier, depth = 0, np.array([source], dtype=np.int64), 0
+    while frontier.size:
+        depth += 1
+        candidates = (frontier[:, None] + offsets).ravel()
+        frontier = np.unique(candidates[dist[candidates] == UNREACHED])
+        dist[frontier] = depth
+    return interior.copy()
+
+class MazeAnalysis:
+    """
+    Distance field for one maze towards its goal, answering path, reachability and
+    distance queries from any cell by table lookup instead of a new search.
+    """
+
+    def __init__(self, maze, target=None):
+        self.field = distance_field(maze, target)
+        self.rows, self.cols = self.field.shape
+
+    def _inside(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def distance(self, r, c):
+        """Steps from (r, c) to the goal, or None if the cell is a wall or cut off."""
+        if not self._inside(r, c): return None
+        d = int(self.field[r, c])
+        return d if d >= 0 else None
+
+    def reachable(self, r, c):
+        return self.distance(r, c) is not None
+
+    def next_step(self, r, c):
+        """The neighbour one step closer to the goal (first in move order), or None."""
+        d = self.distance(r, c)
+        if not d: return None
+        for dr, dc in MOVES:
+            if self._inside(r + dr, c + dc) and self.field[r + dr, c + dc] == d - 1:
+                return [r + dr, c + dc]
+
+    def path_from(self, r, c):
+        """A shortest path [[r, c], ...] from (r, c) to the goal, or [] if there is none."""
+        if not self.reachable(r, c): return []
+        path = [[r, c]]
+        while (step := self.next_step(*path[-1])) is not None:
+            path.append(step)
+        return path
+
+    def summary(self):
+        open_cells = int(np.count_nonzero(self.field != WALL))
+        reachable = self.field >= 0
+        return {"rows": self.rows, "cols": self.cols, "open_cells": open_cells,
+                "reachable_cells": int(np.count_nonzero(reachable)),
+                "shortest_path": self.distance(0, 0),
+                "max_distance": int(self.field.max()) if reachable.any() else None}
+
+def maze_digest(maze):
+    grid = unpack_maze(maze) if is_encoded_maze(maze) else np.asarray(maze, dtype=np.int8)
+    return hashlib.sha256(np.asarray(grid.shape, dtype=np.int64).tobytes() + grid.tobytes()).hexdigest()
+
+class MazeAnalysisCache:
+    """LRU of MazeAnalysis by maze content, so each level's field is computed once."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, maze):
+        digest = maze_digest(maze)
+        with self._lock:
+            analysis = self._entries.get(digest)
+            if analysis is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+        analysis = MazeAnalysis(maze)
+        with self._lock:
+            self._entries[digest] = analysis
+            while len(self._entries) > self.max_entries: self._entries.popitem(last=False)
+        return analysis
+
+    def analyze_levels(self, levels):
+        """Summaries for a whole level file ({difficulty: {level: maze}}) in one pass."""
+        return {difficulty: {level: self.get(maze).summary() for level, maze in by_level.items()}
+                for difficulty, by_level in levels.items()}
+
+    def stats(self):
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,123 @@
+import base64
+import random
+from array import array
+
+import numpy as np
+
+# --- Maze Generation ---
+# Mazes have odd dimensions: passage cells sit at even (r, c) and the cells between
+# them are walls until carved, so (0, 0) and (rows - 1, cols - 1) are always passage
+# cells. Both generators build a spanning tree over the passage cells, so every maze
+# is solvable (and perfect, with exactly one path, unless `loops` opens extra walls).
+# Grids are flat bytearrays (1 = wall, as in the level files) indexed r * cols + c.
+
+def _check_size(rows, cols):
+    if rows < 1 or cols < 1 or rows % 2 == 0 or cols % 2 == 0:
+        raise ValueError(f"Maze dimensions must be odd and positive, got {rows}x{cols}")
+
+def carve_backtracker(rows, cols, rng):
+    """Randomized depth-first carving: long winding corridors with few branches."""
+    _check_size(rows, cols)
+    walls = bytearray([1]) * (rows * cols)
+    walls[0] = 0
+    stack = array('i', [0])
+    steps = ((2, 0), (0, 2), (-2, 0), (0, -2))
+    while stack:
+        r, c = divmod(stack[-1], cols)
+        options = [(dr, dc) for dr, dc in steps
+                   if 0 <= r + dr < rows and 0 <= c + dc < cols and walls[(r + dr) * cols + c + dc]]
+        if not options:
+            stack.pop()
+            continue
+        dr, dc = rng.choice(options)
+        walls[(r + dr // 2) * cols + c + dc // 2] = 0
+        walls[(r + dr) * cols + c + dc] = 0
+        stack.append((r + dr) * cols + c + dc)
+    return walls
+
+def carve_kruskal(rows, cols, rng):
+    """Randomized Kruskal over a union-find forest: many short dead ends, harder to read at a glance."""
+    _check_size(rows, cols)
+    walls = bytearray([1]) * (rows * cols)
+    height, width = rows // 2 + 1, cols // 2 + 1
+    parent = array('i', range(height * width))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    edges = [(i, j, 0) for i in range(height) for j in range(width - 1)] + [(i, j, 1) for i in range(height - 1) for j in range(width)]
+    rng.shuffle(edges)
+    for i in range(height):
+        for j in range(width):
+            walls[2 * i * cols + 2 * j] = 0
+    for i, j, down in edges:
+        a, b = i * width + j, (i + down) * width + j + (1 - down)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_a] = root_b
+            walls[(2 * i + down) * cols + 2 * j + (1 - down)] = 0
+    return walls
+
+CARVERS = {"backtracker": carve_backtracker, "kruskal": carve_kruskal}
+
+def open_loops(walls, rows, cols, fraction, rng):
+    """Knocks out `fraction` of the remaining inner walls between passage cells, adding alternative routes."""
+    candidates = [r * cols + c for r in range(rows) for c in range((r + 1) % 2, cols, 2) if walls[r * cols + c]]
+    for index in rng.sample(candidates, int(len(candidates) * fraction)):
+        walls[index] = 0
+    return walls
+
+def generate_maze(rows, cols, algorithm="backtracker", loops=0.0, seed=None):
+    """A solvable rows x cols maze in the compact encoded form (see encode_maze)."""
+    rng = random.Random(seed)
+    walls = CARVERS[algorithm](rows, cols, rng)
+    if loops: open_loops(walls, rows, cols, loops, rng)
+    return _encode(rows, cols, np.frombuffer(bytes(walls), dtype=np.uint8))
+
+# --- Compact Encoding ---
+# "m1:<rows>x<cols>:<urlsafe base64 of the wall bits, row-major, packed 8 per byte>".
+# A 1001x1001 maze is ~170KB encoded versus ~2MB as a JSON list of lists.
+MAZE_FORMAT = "m1"
+
+def is_encoded_maze(maze):
+    return isinstance(maze, str) and maze.startswith(MAZE_FORMAT + ":")
+
+def _encode(rows, cols, cells):
+    return f"{MAZE_FORMAT}:{rows}x{cols}:" + base64.urlsafe_b64encode(np.packbits(cells).tobytes()).decode('ascii')
+
+def encode_maze(maze):
+    grid = np.asarray(maze, dtype=np.uint8)
+    return _encode(grid.shape[0], grid.shape[1], grid.ravel())
+
+def encoded_maze_size(code):
+    """(rows, cols) from an encoded maze's header, without decoding its data."""
+    try:
+        fmt, size, _ = code.split(":", 2)
+        rows, cols = map(int, size.split("x"))
+    except ValueError:
+        raise ValueError("Malformed encoded maze") from None
+    if fmt != MAZE_FORMAT: raise ValueError(f"Unknown maze format: {fmt}")
+    if rows < 1 or cols < 1: raise ValueError(f"Maze dimensions must be positive, got {rows}x{cols}")
+    return rows, cols
+
+def unpack_maze(code):
+    """The encoded maze as a (rows, cols) uint8 array, 1 = wall."""
+    rows, cols = encoded_maze_size(code)
+    # Require exactly the header's bits, so a short body is never zero-padded up to a huge size.
+    packed = base64.urlsafe_b64decode(code.split(":", 2)[2])
+    if len(packed) != (rows * cols + 7) // 8: raise ValueError("Encoded maze data does not match its size")
+    return np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=rows * cols).reshape(rows, cols)
+
+def decode_maze(code):
+    """The encoded maze as the level files' list of rows."""
+    return unpack_maze(code).tolist()
+
+# --- Endless Levels ---
+def endless_level(level):
+    """Endless level `level` (1, 2, ...): seeded by the level number, growing and losing shortcuts as it rises."""
+    size = min(11 + 4 * level, 101)
+    algorithm = "backtracker" if level % 2 else "kruskal"
+    return generate_maze(size, size, algorithm=algorithm, loops=max(0.0, 0.2 - 0.02 * level), seed=level)
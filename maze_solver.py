@@ -1,93 +1,280 @@
+from array import array
 from collections import deque
 import heapq
 import time
 
-def dfs_solver(maze):
-    rows, cols = len(maze), len(maze[0])
-    visited = set()
-    path = []
-    def dfs(r, c):
-        if not (0 <= r < rows and 0 <= c < cols) or maze[r][c] == 1 or (r, c) in visited:
-            return False
-        visited.add((r, c))
-        path.append([r, c])
-        if r == rows - 1 and c == cols - 1:
-            return True
-        if dfs(r + 1, c) or dfs(r, c + 1) or dfs(r - 1, c) or dfs(r, c - 1):
-            return True
-        path.pop()
-        return False
-    dfs(0, 0)
-    return path
+from maze_generator import is_encoded_maze, unpack_maze
+
+# --- Flat Grid Engine ---
+# Cells are integer ids (r * cols + c) over a bytearray of open cells. Searches keep
+# one parent id per cell and rebuild the [[r, c], ...] path only once the goal is
+# reached, so memory is O(cells) instead of O(cells x path length).
+class MazeGrid:
+    __slots__ = ("rows", "cols", "open", "start", "goal")
+
+    def __init__(self, maze):
+        if is_encoded_maze(maze):
+            walls = unpack_maze(maze)
+            (self.rows, self.cols), self.open = walls.shape, bytearray((walls == 0).tobytes())
+        else:
+            self.rows, self.cols = len(maze), len(maze[0])
+            self.open = bytearray(cell == 0 for row in maze for cell in row)
+        self.start, self.goal = 0, self.rows * self.cols - 1
+
+    @property
+    def size(self):
+        return self.rows * self.cols
+
+    def neighbors(self, cell):
+        """Open neighbours in the solvers' move order: down, right, up, left."""
+        cols, is_open = self.cols, self.open
+        r, c = divmod(cell, cols)
+        result = []
+        if r + 1 < self.rows and is_open[cell + cols]: result.append(cell + cols)
+        if c + 1 < cols and is_open[cell + 1]: result.append(cell + 1)
+        if r > 0 and is_open[cell - cols]: result.append(cell - cols)
+        if c > 0 and is_open[cell - 1]: result.append(cell - 1)
+        return result
+
+    def heuristic(self, cell):
+        r, c = divmod(cell, self.cols)
+        return (self.rows - 1 - r) + (self.cols - 1 - c)
+
+    def new_parents(self):
+        return array('i', [-1]) * self.size
+
+    def path_to(self, parents, cell):
+        cols, path = self.cols, []
+        while cell != -1:
+            path.append(list(divmod(cell, cols)))
+            cell = parents[cell]
+        return path[::-1]
+
+    def step(self, cell, direction):
+        """The open neighbour in `direction` (0-3, same order as neighbors), or -1."""
+        r, c = divmod(cell, self.cols)
+        if direction == 0: nxt = cell + self.cols if r + 1 < self.rows else -1
+        elif direction == 1: nxt = cell + 1 if c + 1 < self.cols else -1
+        elif direction == 2: nxt = cell - self.cols if r > 0 else -1
+        else: nxt = cell - 1 if c > 0 else -1
+        return nxt if nxt != -1 and self.open[nxt] else -1
+
+def _record(stats, nodes):
+    # Solvers take an optional `stats` dict and report the number of cells they expanded in it.
+    if stats is not None: stats["nodes"] = nodes
+
+def dfs_solver(maze, stats=None):
+    # Explicit stack instead of recursion, so long corridors cannot hit the recursion
+    # limit. `stack` is the current path; `next_dir[i]` is the next direction to try
+    # from stack[i], which reproduces the recursive visiting order exactly.
+    grid = MazeGrid(maze)
+    if not grid.open[grid.start]:
+        return []
+    visited = bytearray(grid.size)
+    visited[grid.start] = 1
+    stack, next_dir = array('i', [grid.start]), bytearray(1)
+    nodes = 1
+    while stack:
+        cell = stack[-1]
+        if cell == grid.goal:
+            _record(stats, nodes)
+            return [list(divmod(c, grid.cols)) for c in stack]
+        direction = next_dir[-1]
+        while direction < 4:
+            neighbor = grid.step(cell, direction)
+            direction += 1
+            if neighbor != -1 and not visited[neighbor]:
+                break
+        else:
+            stack.pop()
+            next_dir.pop()
+            continue
+        next_dir[-1] = direction
+        visited[neighbor] = 1
+        stack.append(neighbor)
+        next_dir.append(0)
+        nodes += 1
+    _record(stats, nodes)
+    return []
 
-def bfs_solver(maze):
-    rows, cols = len(maze), len(maze[0])
-    queue = deque([(0, 0, [[0, 0]])])
-    visited = set([(0, 0)])
+def bfs_solver(maze, stats=None):
+    grid = MazeGrid(maze)
+    parents, visited = grid.new_parents(), bytearray(grid.size)
+    queue = deque([grid.start])
+    visited[grid.start] = 1
+    nodes = 0
     while queue:
-        r, c, path = queue.popleft()
-        if r == rows - 1 and c == cols - 1:
-            return path
-        for dr, dc in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and (nr, nc) not in visited and maze[nr][nc] == 0:
-                visited.add((nr, nc))
-                queue.append((nr, nc, path + [[nr, nc]]))
+        cell = queue.popleft()
+        nodes += 1
+        if cell == grid.goal:
+            _record(stats, nodes)
+            return grid.path_to(parents, cell)
+        for neighbor in grid.neighbors(cell):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                parents[neighbor] = cell
+                queue.append(neighbor)
+    _record(stats, nodes)
     return []
 
-def astar_solver(maze):
-    rows, cols = len(maze), len(maze[0])
-    start_node, end_node = (0, 0), (rows - 1, cols - 1)
-    def heuristic(node):
-        return abs(node[0] - end_node[0]) + abs(node[1] - end_node[1])
-    open_list = [(heuristic(start_node), start_node)]
-    came_from, g_score = {}, {start_node: 0}
+def astar_solver(maze, stats=None):
+    grid = MazeGrid(maze)
+    parents = grid.new_parents()
+    g_score = array('i', [-1]) * grid.size
+    g_score[grid.start] = 0
+    open_list = [(grid.heuristic(grid.start), grid.start)]
+    nodes = 0
     while open_list:
         _, current = heapq.heappop(open_list)
-        if current == end_node:
-            path = []
-            while current in came_from:
-                path.append(list(current))
-                current = came_from[current]
-            path.append(list(start_node))
-            return path[::-1]
-        for dr, dc in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            neighbor = (current[0] + dr, current[1] + dc)
-            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and maze[neighbor[0]][neighbor[1]] == 0:
-                tentative_g_score = g_score[current] + 1
-                if tentative_g_score < g_score.get(neighbor, float('inf')):
-                    came_from[neighbor], g_score[neighbor] = current, tentative_g_score
-                    f_score = tentative_g_score + heuristic(neighbor)
-                    heapq.heappush(open_list, (f_score, neighbor))
+        nodes += 1
+        if current == grid.goal:
+            _record(stats, nodes)
+            return grid.path_to(parents, current)
+        tentative_g_score = g_score[current] + 1
+        for neighbor in grid.neighbors(current):
+            if g_score[neighbor] == -1 or tentative_g_score < g_score[neighbor]:
+                parents[neighbor], g_score[neighbor] = current, tentative_g_score
+                heapq.heappush(open_list, (tentative_g_score + grid.heuristic(neighbor), neighbor))
+    _record(stats, nodes)
     return []
 
-def greedy_solver(maze):
-    rows, cols = len(maze), len(maze[0])
-    start_node, end_node = (0, 0), (rows - 1, cols - 1)
-    
-    def heuristic(node):
-        return abs(node[0] - end_node[0]) + abs(node[1] - end_node[1])
-
-    open_list = [(heuristic(start_node), start_node)]
-    came_from = {start_node: None}
-    visited = {start_node}
+def greedy_solver(maze, stats=None):
+    grid = MazeGrid(maze)
+    parents, visited = grid.new_parents(), bytearray(grid.size)
+    visited[grid.start] = 1
+    open_list = [(grid.heuristic(grid.start), grid.start)]
+    nodes = 0
 
     while open_list:
         _, current = heapq.heappop(open_list)
+        nodes += 1
+
+        if current == grid.goal:
+            _record(stats, nodes)
+            return grid.path_to(parents, current)
+
+        for neighbor in grid.neighbors(current):
+            if not visited[neighbor]:
+                visited[neighbor] = 1
+                parents[neighbor] = current
+                heapq.heappush(open_list, (grid.heuristic(neighbor), neighbor))
+
+    _record(stats, nodes)
+    return []
+
+def bidirectional_bfs_solver(maze, stats=None):
+    # BFS from both ends, always growing the smaller frontier by one full layer. The
+    # best meeting found while growing a layer gives a shortest path.
+    grid = MazeGrid(maze)
+    if not grid.open[grid.start] or not grid.open[grid.goal]:
+        _record(stats, 0)
+        return []
+    dist = (array('i', [-1]) * grid.size, array('i', [-1]) * grid.size)
+    parents = (grid.new_parents(), grid.new_parents())
+    frontiers = ([grid.start], [grid.goal])
+    dist[0][grid.start] = dist[1][grid.goal] = 0
+    nodes, meeting = 0, None
+    if grid.start == grid.goal:
+        meeting = (0, grid.start, grid.start)
+    while meeting is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other, own_parents = dist[side], dist[1 - side], parents[side]
+        layer = []
+        for cell in frontiers[side]:
+            nodes += 1
+            for neighbor in grid.neighbors(cell):
+                if other[neighbor] != -1:
+                    total = own[cell] + 1 + other[neighbor]
+                    if meeting is None or total < meeting[0]:
+                        meeting = (total, cell, neighbor) if side == 0 else (total, neighbor, cell)
+                if own[neighbor] == -1:
+                    own[neighbor], own_parents[neighbor] = own[cell] + 1, cell
+                    layer.append(neighbor)
+        frontiers = (layer, frontiers[1]) if side == 0 else (frontiers[0], layer)
+    _record(stats, nodes)
+    if meeting is None:
+        return []
+    _, forward_end, backward_start = meeting
+    path = grid.path_to(parents[0], forward_end)
+    cell = backward_start if backward_start != forward_end else parents[1][forward_end]
+    while cell != -1:
+        path.append(list(divmod(cell, grid.cols)))
+        cell = parents[1][cell]
+    return path
+
+# --- Jump Point Search ---
+# JPS for a uniform-cost 4-connected grid. Canonical shortest paths take vertical
+# moves first, so a horizontal run only stops where a vertical turn is forced (the
+# cell beside it is open but the one diagonally behind is blocked), while a vertical
+# run stops wherever a horizontal run from it reaches a jump point. Only jump points
+# enter the open list; the straight segments between them are filled in at the end.
+def _jump(grid, cell, dr, dc):
+    rows, cols, is_open, goal = grid.rows, grid.cols, grid.open, grid.goal
+    r, c = divmod(cell, cols)
+    while True:
+        r, c = r + dr, c + dc
+        if not (0 <= r < rows and 0 <= c < cols) or not is_open[r * cols + c]:
+            return -1
+        cell = r * cols + c
+        if cell == goal:
+            return cell
+        if dc:
+            for vr in (1, -1):
+                if 0 <= r + vr < rows and is_open[cell + vr * cols] and (not 0 <= c - dc < cols or not is_open[cell + vr * cols - dc]):
+                    return cell
+        elif _jump(grid, cell, 0, 1) != -1 or _jump(grid, cell, 0, -1) != -1:
+            return cell
+
+def _jps_directions(grid, cell, parent):
+    if parent == -1:
+        return ((1, 0), (0, 1), (-1, 0), (0, -1))
+    (r, c), (pr, pc) = divmod(cell, grid.cols), divmod(parent, grid.cols)
+    dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+    if dr:
+        return ((dr, 0), (0, 1), (0, -1))
+    directions = [(0, dc)]
+    for vr in (1, -1):
+        if 0 <= r + vr < grid.rows and grid.open[cell + vr * grid.cols] and (not 0 <= c - dc < grid.cols or not grid.open[cell + vr * grid.cols - dc]):
+            directions.append((vr, 0))
+    return directions
 
-        if current == end_node:
-            path = []
-            while current is not None:
-                path.append(list(current))
-                current = came_from[current]
-            return path[::-1]
-
-        for dr, dc in [(1, 0), (0, 1), (-1, 0), (0, -1)]:
-            neighbor = (current[0] + dr, current[1] + dc)
-
-            if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and maze[neighbor[0]][neighbor[1]] == 0 and neighbor not in visited:
-                visited.add(neighbor)
-                came_from[neighbor] = current
-                heapq.heappush(open_list, (heuristic(neighbor), neighbor))
-    
+def jps_solver(maze, stats=None):
+    grid = MazeGrid(maze)
+    if not grid.open[grid.start]:
+        _record(stats, 0)
+        return []
+    parents = grid.new_parents()
+    g_score = array('i', [-1]) * grid.size
+    g_score[grid.start] = 0
+    open_list = [(grid.heuristic(grid.start), grid.start)]
+    nodes = 0
+    while open_list:
+        f, current = heapq.heappop(open_list)
+        if f - grid.heuristic(current) > g_score[current]:
+            continue
+        nodes += 1
+        if current == grid.goal:
+            _record(stats, nodes)
+            return _fill_segments(grid, grid.path_to(parents, current))
+        for dr, dc in _jps_directions(grid, current, parents[current]):
+            jump_point = _jump(grid, current, dr, dc)
+            if jump_point == -1:
+                continue
+            r, c = divmod(jump_point, grid.cols)
+            cr, cc = divmod(current, grid.cols)
+            tentative_g_score = g_score[current] + abs(r - cr) + abs(c - cc)
+            if g_score[jump_point] == -1 or tentative_g_score < g_score[jump_point]:
+                parents[jump_point], g_score[jump_point] = current, tentative_g_score
+                heapq.heappush(open_list, (tentative_g_score + grid.heuristic(jump_point), jump_point))
+    _record(stats, nodes)
     return []
+
+def _fill_segments(grid, jump_points):
+    path = jump_points[:1]
+    for r, c in jump_points[1:]:
+        pr, pc = path[-1]
+        dr, dc = (r > pr) - (r < pr), (c > pc) - (c < pc)
+        while (pr, pc) != (r, c):
+            pr, pc = pr + dr, pc + dc
+            path.append([pr, pc])
+    return path
@@ -2,6 +2,7 @@ import time
 import random
 from collections import deque
 import heapq
+from search_budget import check_budget
 
 # --- Helper Function ---
 def create_board_map(board):
@@ -65,7 +66,7 @@ def solve_memory_greedy(board):
     return path, f"{(end_time - start_time):.12f}"
 
 # --- A* Search Solver ---
-def solve_memory_astar(board):
+def solve_memory_astar(board, max_nodes=None):
     start_time = time.perf_counter()
     
     n = len(board)
@@ -78,9 +79,12 @@ def solve_memory_astar(board):
     open_list = [(heuristic(start_state), 0, start_state)] 
     came_from = {start_state: None}
     g_scores = {start_state: 0}
+    nodes = 0
 
     while open_list:
         _, g_score, current_state = heapq.heappop(open_list)
+        nodes += 1
+        check_budget(nodes, max_nodes)
         
         matched, memory_tuple = current_state
         
@@ -0,0 +1,313 @@
+import json
+import os
+import re
+import sqlite3
+import heapq
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from contextlib import contextmanager
+
+LEVEL_KEY_PATTERN = re.compile(r"([a-z_]+)_(\w+)-(\d+)")
+
+def parse_level_key(level_key):
+    """Splits 'maze_easy-1' into ('maze', 'easy', '1'); returns None for unknown keys."""
+    match = LEVEL_KEY_PATTERN.match(level_key)
+    return match.groups() if match else None
+
+# --- Base Interface ---
+class ProgressStore(ABC):
+    """Per-user level progress: {email: {level_key: {field: value}}}."""
+
+    @abstractmethod
+    def get_user(self, email):
+        ...
+
+    @abstractmethod
+    def update_level(self, email, level_key, **fields):
+        ...
+
+    @abstractmethod
+    def delete_level(self, email, level_key):
+        ...
+
+    @abstractmethod
+    def delete_user(self, email):
+        ...
+
+    @abstractmethod
+    def all_progress(self):
+        ...
+
+    @abstractmethod
+    def game_progress(self, game):
+        """Returns {email: {level_key: data}} restricted to one game."""
+
+    @abstractmethod
+    def level_progress(self, level_key):
+        """Returns {email: data} for every user who played one level."""
+
+    @abstractmethod
+    def played_levels(self):
+        """Yields (email, level_key, game, difficulty, level) without decoding level data."""
+
+    # --- Aggregates ---
+    @abstractmethod
+    def play_counts(self):
+        """Returns {email: number of levels played}."""
+
+    @abstractmethod
+    def game_counts(self):
+        """Returns {game: number of (user, level) plays}."""
+
+    @abstractmethod
+    def total_plays(self):
+        ...
+
+    @abstractmethod
+    def top_players(self, limit):
+        """Returns [(email, plays)] for the `limit` users with the most plays."""
+
+# --- JSON File Backend (legacy) ---
+class JsonProgressStore(ProgressStore):
+    """Keeps the whole progress map in one JSON file. Every write rewrites the file."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if not os.path.exists(self.file_path): return {}
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f: return json.load(f)
+        except (json.JSONDecodeError, FileNotFoundError): return {}
+
+    def _save(self, progress):
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "w", encoding='utf-8') as f: json.dump(progress, f, indent=2)
+        os.replace(tmp_path, self.file_path)
+
+    def get_user(self, email):
+        return self._load().get(email, {})
+
+    def update_level(self, email, level_key, **fields):
+        with self._lock:
+            progress = self._load()
+            level_data = progress.setdefault(email, {}).setdefault(level_key, {})
+            level_data.update(fields)
+            self._save(progress)
+            return level_data
+
+    def delete_level(self, email, level_key):
+        with self._lock:
+            progress = self._load()
+            if email not in progress or level_key not in progress[email]: return False
+            del progress[email][level_key]
+            if not progress[email]: del progress[email]
+            self._save(progress)
+            return True
+
+    def delete_user(self, email):
+        with self._lock:
+            progress = self._load()
+            if email not in progress: return False
+            del progress[email]
+            self._save(progress)
+            return True
+
+    def all_progress(self):
+        return self._load()
+
+    def game_progress(self, game):
+        result = {}
+        for email, levels in self._load().items():
+            for level_key, data in levels.items():
+                parsed = parse_level_key(level_key)
+                if parsed and parsed[0] == game:
+                    result.setdefault(email, {})[level_key] = data
+        return result
+
+    def level_progress(self, level_key):
+        return {email: levels[level_key] for email, levels in self._load().items() if level_key in levels}
+
+    def played_levels(self):
+        for email, levels in self._load().items():
+            for level_key in levels:
+                yield (email, level_key) + (parse_level_key(level_key) or (None, None, None))
+
+    # The JSON backend has no write-time aggregates; it recounts the file on read.
+    def play_counts(self):
+        return {email: len(levels) for email, levels in self._load().items() if levels}
+
+    def game_counts(self):
+        counts = Counter()
+        for _, _, game, _, _ in self.played_levels():
+            if game: counts[game] += 1
+        return dict(counts)
+
+    def total_plays(self):
+        return sum(self.play_counts().values())
+
+    def top_players(self, limit):
+        return heapq.nlargest(limit, self.play_counts().items(), key=lambda item: item[1])
+
+# --- SQLite Backend (default) ---
+class SqliteProgressStore(ProgressStore):
+    """
+    One row per (email, level_key), indexed by email (primary key prefix), game and level_key.
+    Writes are single-row upserts inside an IMMEDIATE transaction, so concurrent
+    gunicorn workers serialize on the database lock instead of overwriting each other.
+    Per-user and per-game play counts are materialized by triggers in the same transaction.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS progress (
+            email TEXT NOT NULL,
+            level_key TEXT NOT NULL,
+            game TEXT,
+            difficulty TEXT,
+            level TEXT,
+            data TEXT NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (email, level_key)
+        );
+        CREATE INDEX IF NOT EXISTS idx_progress_game ON progress (game);
+        CREATE INDEX IF NOT EXISTS idx_progress_level_key ON progress (level_key);
+        CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, applied_at REAL NOT NULL);
+
+        CREATE TABLE IF NOT EXISTS user_play_counts (email TEXT PRIMARY KEY, plays INTEGER NOT NULL);
+        CREATE INDEX IF NOT EXISTS idx_user_play_counts_plays ON user_play_counts (plays DESC);
+        CREATE TABLE IF NOT EXISTS game_play_counts (game TEXT PRIMARY KEY, plays INTEGER NOT NULL);
+
+        CREATE TRIGGER IF NOT EXISTS progress_insert_counts AFTER INSERT ON progress BEGIN
+            INSERT INTO user_play_counts (email, plays) VALUES (NEW.email, 1)
+                ON CONFLICT (email) DO UPDATE SET plays = plays + 1;
+            INSERT INTO game_play_counts (game, plays) SELECT NEW.game, 1 WHERE NEW.game IS NOT NULL
+                ON CONFLICT (game) DO UPDATE SET plays = plays + 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS progress_delete_counts AFTER DELETE ON progress BEGIN
+            UPDATE user_play_counts SET plays = plays - 1 WHERE email = OLD.email;
+            DELETE FROM user_play_counts WHERE email = OLD.email AND plays <= 0;
+            UPDATE game_play_counts SET plays = plays - 1 WHERE game = OLD.game;
+            DELETE FROM game_play_counts WHERE game = OLD.game AND plays <= 0;
+        END;
+    """
+
+    def __init__(self, db_path, json_path=None):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connection().executescript(self.SCHEMA)
+        self._backfill_counts()
+        if json_path: self.migrate_from_json(json_path)
+
+    def _connection(self):
+        # sqlite3 connections must not be shared across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    @staticmethod
+    def _row_values(email, level_key, data):
+        game, difficulty, level = parse_level_key(level_key) or (None, None, None)
+        return (email, level_key, game, difficulty, level, json.dumps(data), time.time())
+
+    def _upsert(self, conn, email, level_key, data):
+        conn.execute(
+            "INSERT INTO progress (email, level_key, game, difficulty, level, data, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (email, level_key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+            self._row_values(email, level_key, data))
+
+    def _backfill_counts(self):
+        # Databases created before the count tables existed need one recount; triggers keep them current after that.
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE name = 'play_counts'").fetchone(): return
+            conn.execute("DELETE FROM user_play_counts")
+            conn.execute("DELETE FROM game_play_counts")
+            conn.execute("INSERT INTO user_play_counts (email, plays) SELECT email, COUNT(*) FROM progress GROUP BY email")
+            conn.execute("INSERT INTO game_play_counts (game, plays) SELECT game, COUNT(*) FROM progress WHERE game IS NOT NULL GROUP BY game")
+            conn.execute("INSERT INTO migrations (name, applied_at) VALUES ('play_counts', ?)", (time.time(),))
+
+    def migrate_from_json(self, json_path):
+        """One-shot import of a legacy progress JSON file. Later calls are no-ops."""
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM migrations WHERE name = 'json_import'").fetchone(): return False
+            legacy = JsonProgressStore(json_path).all_progress()
+            for email, levels in legacy.items():
+                for level_key, data in levels.items():
+                    self._upsert(conn, email, level_key, data)
+            conn.execute("INSERT INTO migrations (name, applied_at) VALUES ('json_import', ?)", (time.time(),))
+            return True
+
+    def get_user(self, email):
+        rows = self._connection().execute("SELECT level_key, data FROM progress WHERE email = ? ORDER BY rowid", (email,))
+        return {level_key: json.loads(data) for level_key, data in rows}
+
+    def update_level(self, email, level_key, **fields):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM progress WHERE email = ? AND level_key = ?", (email, level_key)).fetchone()
+            level_data = json.loads(row[0]) if row else {}
+            level_data.update(fields)
+            self._upsert(conn, email, level_key, level_data)
+            return level_data
+
+    def delete_level(self, email, level_key):
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM progress WHERE email = ? AND level_key = ?", (email, level_key)).rowcount > 0
+
+    def delete_user(self, email):
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM progress WHERE email = ?", (email,)).rowcount > 0
+
+    def all_progress(self):
+        progress = {}
+        for email, level_key, data in self._connection().execute("SELECT email, level_key, data FROM progress ORDER BY rowid"):
+            progress.setdefault(email, {})[level_key] = json.loads(data)
+        return progress
+
+    def game_progress(self, game):
+        progress = {}
+        for email, level_key, data in self._connection().execute("SELECT email, level_key, data FROM progress WHERE game = ?", (game,)):
+            progress.setdefault(email, {})[level_key] = json.loads(data)
+        return progress
+
+    def level_progress(self, level_key):
+        rows = self._connection().execute("SELECT email, data FROM progress WHERE level_key = ? ORDER BY rowid", (level_key,))
+        return {email: json.loads(data) for email, data in rows}
+
+    def played_levels(self):
+        return self._connection().execute("SELECT email, level_key, game, difficulty, level FROM progress ORDER BY rowid").fetchall()
+
+    def play_counts(self):
+        return dict(self._connection().execute("SELECT email, plays FROM user_play_counts"))
+
+    def game_counts(self):
+        return dict(self._connection().execute("SELECT game, plays FROM game_play_counts"))
+
+    def total_plays(self):
+        return self._connection().execute("SELECT COALESCE(SUM(plays), 0) FROM user_play_counts").fetchone()[0]
+
+    def top_players(self, limit):
+        return self._connection().execute(
+            "SELECT email, plays FROM user_play_counts ORDER BY plays DESC, email LIMIT ?", (limit,)).fetchall()
+
+def create_progress_store(backend, json_path, db_path):
+    if backend == "json": return JsonProgressStore(json_path)
+    if backend == "sqlite": return SqliteProgressStore(db_path, json_path=json_path)
+    raise ValueError(f"Unknown progress backend: {backend}")
@@ -0,0 +1,121 @@
+"""
+Additive pattern databases for the sliding puzzle.
+
+The tiles are split into disjoint groups. Each group's database stores, for every
+placement of its tiles, the fewest moves *of those tiles* needed to bring them home
+(blank moves through other cells are free), so the per-group values can be summed
+into an admissible heuristic. Tables are flat bytes indexed by
+sum(position_i * cells ** i) and stored as files that are memory-mapped at load:
+
+    python puzzle_pdb.py 4          # builds data/pdb/puzzle4.pdb (5-5-5 split, a few minutes)
+"""
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "pdb")
+MAGIC = b"PDB1"
+UNSEEN = 255
+
+# Tile groups per board width; each group's table has cells ** len(group) entries.
+PARTITIONS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 5, 6), (4, 7, 8, 11, 12), (9, 10, 13, 14, 15)),
+}
+
+def pdb_path(size, directory=PDB_DIR):
+    return os.path.join(directory, f"puzzle{size}.pdb")
+
+def build_pattern_table(size, group):
+    """
+    Breadth-first search back from the goal over (group tile positions, blank position),
+    one cost level at a time: blank moves through free cells cost nothing and are
+    expanded within the level, moves of a group tile feed the next level.
+    """
+    cells = size * size
+    neighbors = [[p + d for d, ok in ((-size, p >= size), (size, p < cells - size), (-1, p % size), (1, p % size < size - 1)) if ok]
+                 for p in range(cells)]
+    weights = [cells ** i for i in range(len(group))]
+    table = bytearray([UNSEEN]) * (cells ** len(group))
+    seen = bytearray(cells ** len(group) * cells)
+    start = sum((tile - 1) * w for tile, w in zip(group, weights))
+    level, cost = array('q', [start * cells + cells - 1]), 0
+    while level:
+        next_level = array('q')
+        while level:
+            node = level.pop()
+            if seen[node]: continue
+            seen[node] = 1
+            index, blank = divmod(node, cells)
+            if cost < table[index]: table[index] = cost
+            positions = [(index // w) % cells for w in weights]
+            for target in neighbors[blank]:
+                if target in positions:
+                    moved = index + (blank - target) * weights[positions.index(target)]
+                    if not seen[moved * cells + target]: next_level.append(moved * cells + target)
+                elif not seen[index * cells + target]:
+                    level.append(index * cells + target)
+        level, cost = next_level, cost + 1
+    return table
+
+def build_database(size, partition=None, directory=PDB_DIR):
+    """Builds every group's table and writes them to one file: header, then the tables back to back."""
+    partition = partition or PARTITIONS[size]
+    os.makedirs(directory, exist_ok=True)
+    path = pdb_path(size, directory)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("BB", size, len(partition)))
+        for group in partition:
+            f.write(struct.pack("B", len(group)) + bytes(group))
+        for group in partition:
+            f.write(build_pattern_table(size, group))
+    os.replace(tmp_path, path)
+    return path
+
+class PatternDatabase:
+    """A memory-mapped database file: `groups` and, per group, (offset, weights) into the mapping."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.data[:4] != MAGIC: raise ValueError(f"{path} is not a pattern database")
+        self.size, count = self.data[4], self.data[5]
+        cells, offset, groups = self.size * self.size, 6, []
+        for _ in range(count):
+            k = self.data[offset]
+            groups.append(tuple(self.data[offset + 1:offset + 1 + k]))
+            offset += 1 + k
+        self.groups, self.tables = groups, []
+        for group in groups:
+            self.tables.append((offset, array('q', [cells ** i for i in range(len(group))])))
+            offset += cells ** len(group)
+        if offset != len(self.data): raise ValueError(f"{path} is truncated")
+
+    def indexes(self, state):
+        """Per-group table index for a board (positions of each group's tiles)."""
+        where = {tile: pos for pos, tile in enumerate(state)}
+        return [sum(where[tile] * weight for tile, weight in zip(group, weights))
+                for group, (_, weights) in zip(self.groups, self.tables)]
+
+    def lookup(self, group_number, index):
+        return self.data[self.tables[group_number][0] + index]
+
+_loaded = {}
+_load_lock = threading.Lock()
+
+def load_pattern_database(size, directory=PDB_DIR):
+    """The database for `size` if its file exists (mapped once per process), else None."""
+    key = (size, directory)
+    with _load_lock:
+        if key not in _loaded:
+            path = pdb_path(size, directory)
+            _loaded[key] = PatternDatabase(path) if os.path.exists(path) else None
+        return _loaded[key]
+
+if __name__ == "__main__":
+    for size in map(int, sys.argv[1:] or ["3"]):
+        print("wrote", build_database(size))
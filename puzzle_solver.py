@@ -1,7 +1,10 @@
 import time
 import heapq
 from collections import deque
+from functools import lru_cache
 from math import sqrt
+from search_budget import SearchBudgetExceeded, check_budget
+from puzzle_pdb import load_pattern_database
 
 def get_neighbors(state):
     size = int(sqrt(len(state)))
@@ -29,77 +32,304 @@ def manhattan_distance(state):
             distance += abs(goal_x - current_x) + abs(goal_y - current_y)
     return distance
 
-def solve_puzzle_astar(initial_state):
+# --- Packed States ---
+# A board packs into one int, 4 bits per tile with position 0 most significant (so
+# packed states order like the tile lists) and the blank's position in the low 4 bits.
+# Searches keep ints in their queues and one parent int per state, and rebuild the
+# list-of-lists path only at the goal.
+
+@lru_cache(maxsize=None)
+def _packed_tables(size):
+    """(shift per position, blank targets per position in get_neighbors order, Manhattan distance per tile and position)."""
+    cells = size * size
+    shifts = [4 * (cells - p) for p in range(cells)]
+    moves = []
+    for zero_index in range(cells):
+        x, y = zero_index % size, zero_index // size
+        moves.append([(y + dy) * size + x + dx for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)] if 0 <= x + dx < size and 0 <= y + dy < size])
+    dist = [[0] * cells] + [[abs((t - 1) % size - p % size) + abs((t - 1) // size - p // size) for p in range(cells)] for t in range(1, cells)]
+    return shifts, moves, dist
+
+def pack_state(state):
+    key = 0
+    for tile in state: key = key << 4 | tile
+    return key << 4 | state.index(0)
+
+def unpack_state(key, cells):
+    return [(key >> 4 * (cells - p)) & 15 for p in range(cells)]
+
+def _packed_path(parents, key, cells):
+    path = []
+    while key is not None:
+        path.append(unpack_state(key, cells))
+        key = parents[key]
+    return path[::-1]
+
+def solve_puzzle_astar(initial_state, max_nodes=None):
     start_time = time.perf_counter()
-    
-    goal_state = tuple(list(range(1, len(initial_state))) + [0])
-    
-    open_list = [(manhattan_distance(initial_state), initial_state, [initial_state])]
-    visited = {tuple(initial_state)}
-    
+    if not is_solvable(initial_state):
+        return (None, f"{time.perf_counter() - start_time:.10f}")
+    cells = len(initial_state)
+    shifts, moves, dist = _packed_tables(int(sqrt(cells)))
+
+    start = pack_state(initial_state)
+    goal = pack_state(list(range(1, cells)) + [0])
+    h0 = manhattan_distance(initial_state)
+    open_list = [(h0, start, 0)]
+    parents = {start: None}
+    nodes = 0
+    best = (h0, start)
+
     while open_list:
-        _, current_state, path = heapq.heappop(open_list)
-        
-        if tuple(current_state) == goal_state:
-            elapsed = time.perf_counter() - start_time
-            return (path, f"{elapsed:.10f}")
-            
-        for neighbor in get_neighbors(current_state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                new_path = path + [list(neighbor)]
-                priority = len(new_path) - 1 + manhattan_distance(neighbor)
-                heapq.heappush(open_list, (priority, list(neighbor), new_path))
-    elapsed = time.perf_counter() - start_time
-    return (None, f"{elapsed:.10f}")
-
-def solve_puzzle_bfs(initial_state):
+        f, current, g = heapq.heappop(open_list)
+        nodes += 1
+        if max_nodes is not None:
+            # Keep the closest state seen so a budget stop can return the path to it as a partial result.
+            check_budget(nodes, max_nodes, partial=lambda: [initial_state] + _packed_path(parents, best[1], cells)[1:])
+            if f - g < best[0]: best = (f - g, current)
+
+        if current == goal:
+            path = _packed_path(parents, current, cells)
+            path[0] = initial_state
+            return (path, f"{time.perf_counter() - start_time:.10f}")
+
+        blank = current & 15
+        for target in moves[blank]:
+            tile = (current >> shifts[target]) & 15
+            neighbor = current - (tile << shifts[target]) + (tile << shifts[blank]) - blank + target
+            if neighbor not in parents:
+                parents[neighbor] = current
+                h = f - g + dist[tile][blank] - dist[tile][target]
+                heapq.heappush(open_list, (g + 1 + h, neighbor, g + 1))
+    return (None, f"{time.perf_counter() - start_time:.10f}")
+
+def solve_puzzle_bfs(initial_state, max_nodes=None):
     start_time = time.perf_counter()
-    
-    goal_state = tuple(list(range(1, len(initial_state))) + [0])
-    
-    queue = deque([(initial_state, [initial_state])])
-    visited = {tuple(initial_state)}
-    
+    if not is_solvable(initial_state):
+        return (None, f"{time.perf_counter() - start_time:.10f}")
+    cells = len(initial_state)
+    shifts, moves, _ = _packed_tables(int(sqrt(cells)))
+
+    start = pack_state(initial_state)
+    goal = pack_state(list(range(1, cells)) + [0])
+    queue = deque([start])
+    parents = {start: None}
+    nodes = 0
+
     while queue:
-        current_state_list, path = queue.popleft()
-        
-        if tuple(current_state_list) == goal_state:
-            elapsed = time.perf_counter() - start_time
-            return (path, f"{elapsed:.10f}")
-            
-        for neighbor in get_neighbors(current_state_list):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append((list(neighbor), path + [list(neighbor)]))
+        current = queue.popleft()
+        nodes += 1
+        check_budget(nodes, max_nodes)
+
+        if current == goal:
+            path = _packed_path(parents, current, cells)
+            path[0] = initial_state
+            return (path, f"{time.perf_counter() - start_time:.10f}")
+
+        blank = current & 15
+        for target in moves[blank]:
+            tile = (current >> shifts[target]) & 15
+            neighbor = current - (tile << shifts[target]) + (tile << shifts[blank]) - blank + target
+            if neighbor not in parents:
+                parents[neighbor] = current
+                queue.append(neighbor)
 
-    elapsed = time.perf_counter() - start_time
-    return (None, f"{elapsed:.10f}")
+    return (None, f"{time.perf_counter() - start_time:.10f}")
 
-def solve_puzzle_iddfs(initial_state):
+def solve_puzzle_iddfs(initial_state, max_nodes=None, time_limit=None, table_size=0, max_depth=80):
+    """
+    Depth-limited DFS with increasing limits over one in-place stack of packed states.
+    An on-path set makes cycle checks O(1) and the move that undoes the previous one is
+    never tried. With `table_size`, up to that many states per iteration remember the
+    largest remaining depth they were searched with, and revisits with no more depth
+    left are cut. Stops with SearchBudgetExceeded after `max_nodes` expansions or
+    `time_limit` seconds.
+    """
     start_time = time.perf_counter()
-    size = int(sqrt(len(initial_state)))
-    goal_state = tuple(list(range(1, size*size)) + [0])
-    
-    def dls(path, depth_limit):
-        current_state = tuple(path[-1])
-        if current_state == goal_state:
-            return path
-        if len(path) > depth_limit:
-            return None
-        for neighbor in get_neighbors(list(current_state)):
-            if tuple(neighbor) not in [tuple(p) for p in path]:
-                new_path = path + [list(neighbor)]
-                result = dls(new_path, depth_limit)
-                if result is not None:
-                    return result
-        return None
-
-    for depth in range(35):
-        result_path = dls([initial_state], depth)
-        if result_path:
-            elapsed = time.perf_counter() - start_time
-            return (result_path, f"{elapsed:.10f}")
-            
-    elapsed = time.perf_counter() - start_time
-    return (None, f"{elapsed:.10f}")
+    if not is_solvable(initial_state):
+        return (None, f"{time.perf_counter() - start_time:.10f}")
+    cells = len(initial_state)
+    shifts, moves, _ = _packed_tables(int(sqrt(cells)))
+    start = pack_state(initial_state)
+    goal = pack_state(list(range(1, cells)) + [0])
+    deadline = start_time + time_limit if time_limit is not None else None
+    path, on_path, table = [start], {start}, {}
+    nodes = 0
+
+    def dls(current, remaining, prev_blank):
+        nonlocal nodes
+        nodes += 1
+        check_budget(nodes, max_nodes)
+        if deadline is not None and nodes % 4096 == 0 and time.perf_counter() > deadline:
+            raise SearchBudgetExceeded(nodes)
+        if current == goal:
+            return True
+        if remaining == 0:
+            return False
+        if table_size:
+            seen = table.get(current)
+            if seen is not None and seen >= remaining:
+                return False
+            if seen is not None or len(table) < table_size:
+                table[current] = remaining
+        blank = current & 15
+        for target in moves[blank]:
+            if target == prev_blank:
+                continue
+            tile = (current >> shifts[target]) & 15
+            neighbor = current - (tile << shifts[target]) + (tile << shifts[blank]) - blank + target
+            if neighbor in on_path:
+                continue
+            path.append(neighbor)
+            on_path.add(neighbor)
+            if dls(neighbor, remaining - 1, blank):
+                return True
+            path.pop()
+            on_path.discard(neighbor)
+        return False
+
+    for depth in range(max_depth + 1):
+        table.clear()
+        if dls(start, depth, -1):
+            result_path = [initial_state] + [unpack_state(key, cells) for key in path[1:]]
+            return (result_path, f"{time.perf_counter() - start_time:.10f}")
+
+    return (None, f"{time.perf_counter() - start_time:.10f}")
+
+# --- IDA* ---
+def is_solvable(state):
+    """Inversion-parity test: only half of all tile arrangements can reach the goal."""
+    size = int(sqrt(len(state)))
+    tiles = [t for t in state if t]
+    inversions = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+    if size % 2: return inversions % 2 == 0
+    return (inversions + size - state.index(0) // size) % 2 == 1
+
+def _lis_length(sequence):
+    tails = []
+    for x in sequence:
+        i = next((i for i, t in enumerate(tails) if t >= x), len(tails))
+        if i == len(tails): tails.append(x)
+        else: tails[i] = x
+    return len(tails)
+
+def _line_conflict(goal_spots):
+    """
+    Linear-conflict penalty for one row or column, given the goal offsets (in current
+    order) of the tiles already in their goal line: every tile that must leave the
+    line to let the others pass costs two extra moves on top of Manhattan distance.
+    """
+    return 2 * (len(goal_spots) - _lis_length(goal_spots))
+
+def solve_puzzle_idastar(initial_state, max_nodes=None, use_pdb=True):
+    """
+    Iterative-deepening A* over one mutable board with every heuristic term updated
+    incrementally per move: Manhattan distance, linear conflicts of the two lines the
+    moved tile leaves and enters, and (if a database file exists for this board size)
+    the additive pattern database of the moved tile's group. h is the larger of
+    Manhattan + linear conflict and the pattern-database sum; both are admissible.
+    """
+    start_time = time.perf_counter()
+    n = int(sqrt(len(initial_state)))
+    cells = n * n
+    board = list(initial_state)
+    if not is_solvable(board):
+        return (None, f"{time.perf_counter() - start_time:.10f}")
+
+    dist = [[0] * cells] + [[abs((t - 1) // n - p // n) + abs((t - 1) % n - p % n) for p in range(cells)] for t in range(1, cells)]
+    neighbors = [[p + d for d, ok in ((-n, p >= n), (n, p < cells - n), (-1, p % n), (1, p % n < n - 1)) if ok] for p in range(cells)]
+    # Conflict values memoized per line by the line's contents (at most 43680 per line on 4x4).
+    row_memo, col_memo = [{} for _ in range(n)], [{} for _ in range(n)]
+
+    def row_conflict(r):
+        line = tuple(board[r * n:(r + 1) * n])
+        value = row_memo[r].get(line)
+        if value is None:
+            value = row_memo[r][line] = _line_conflict([(t - 1) % n for t in line if t and (t - 1) // n == r])
+        return value
+
+    def col_conflict(c):
+        line = tuple(board[c::n])
+        value = col_memo[c].get(line)
+        if value is None:
+            value = col_memo[c][line] = _line_conflict([(t - 1) // n for t in line if t and (t - 1) % n == c])
+        return value
+
+    rows_lc, cols_lc = [row_conflict(r) for r in range(n)], [col_conflict(c) for c in range(n)]
+    md = sum(dist[t][p] for p, t in enumerate(board))
+    lc = sum(rows_lc) + sum(cols_lc)
+
+    pdb = load_pattern_database(n) if use_pdb else None
+    if pdb:
+        group_of = {tile: (g, weights[i]) for g, (group, (_, weights)) in enumerate(zip(pdb.groups, pdb.tables)) for i, tile in enumerate(group)}
+        pdb_data, pdb_offset = pdb.data, [offset for offset, _ in pdb.tables]
+        pdb_index = pdb.indexes(board)
+        pdb_value = [pdb.lookup(g, i) for g, i in enumerate(pdb_index)]
+        pdb_sum = sum(pdb_value)
+    else:
+        pdb_sum = 0
+
+    moves, nodes = [], 0
+    FOUND = -1
+
+    def search(blank, g, bound, prev):
+        nonlocal md, lc, pdb_sum, nodes
+        h = md + lc if md + lc > pdb_sum else pdb_sum
+        if g + h > bound: return g + h
+        if md == 0: return FOUND
+        nodes += 1
+        check_budget(nodes, max_nodes)
+        minimum = None
+        for target in neighbors[blank]:
+            if target == prev: continue
+            tile = board[target]
+            board[blank], board[target] = tile, 0
+            md_delta = dist[tile][blank] - dist[tile][target]
+            md += md_delta
+            if blank // n == target // n:
+                lines, a, b = cols_lc, blank % n, target % n
+                new_a, new_b = col_conflict(a), col_conflict(b)
+            else:
+                lines, a, b = rows_lc, blank // n, target // n
+                new_a, new_b = row_conflict(a), row_conflict(b)
+            old_a, old_b = lines[a], lines[b]
+            lines[a], lines[b] = new_a, new_b
+            lc_delta = new_a + new_b - old_a - old_b
+            lc += lc_delta
+            if pdb:
+                group, weight = group_of[tile]
+                old_index, old_value = pdb_index[group], pdb_value[group]
+                pdb_index[group] = old_index + (blank - target) * weight
+                pdb_value[group] = pdb_data[pdb_offset[group] + pdb_index[group]]
+                pdb_sum += pdb_value[group] - old_value
+            moves.append(target)
+
+            result = search(target, g + 1, bound, blank)
+            if result == FOUND: return FOUND
+
+            moves.pop()
+            if pdb:
+                pdb_sum += old_value - pdb_value[group]
+                pdb_index[group], pdb_value[group] = old_index, old_value
+            lines[a], lines[b] = old_a, old_b
+            lc -= lc_delta
+            md -= md_delta
+            board[target], board[blank] = tile, 0
+            if minimum is None or result < minimum: minimum = result
+        return minimum
+
+    blank = board.index(0)
+    bound = md + lc if md + lc > pdb_sum else pdb_sum
+    while True:
+        result = search(blank, 0, bound, -1)
+        if result == FOUND: break
+        if result is None:
+            return (None, f"{time.perf_counter() - start_time:.10f}")
+        bound = result
+
+    path, state, blank = [list(initial_state)], list(initial_state), initial_state.index(0)
+    for target in moves:
+        state[blank], state[target] = state[target], 0
+        path.append(list(state))
+        blank = target
+    return (path, f"{time.perf_counter() - start_time:.10f}")
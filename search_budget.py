@@ -0,0 +1,11 @@
+class SearchBudgetExceeded(Exception):
+    """Raised by a solver that was given `max_nodes` and expanded more nodes than that."""
+
+    def __init__(self, nodes, partial=None):
+        super().__init__(f"search stopped after expanding {nodes} nodes")
+        self.nodes = nodes
+        self.partial = partial
+
+def check_budget(nodes, max_nodes, partial=None):
+    if max_nodes is not None and nodes > max_nodes:
+        raise SearchBudgetExceeded(nodes, partial() if callable(partial) else partial)
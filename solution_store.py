@@ -0,0 +1,154 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from level_catalog import GAME_LEVEL_FILES, LevelCatalog
+from solver_cache import solver_digest
+from solver_registry import SOLVERS, level_payload
+from solver_service import SolverService
+
+def solution_metrics(game, result):
+    solution = result[0]
+    metrics = {"ai_time": result[-1], "solved": bool(solution)}
+    if isinstance(solution, (list, dict)): metrics["solution_length"] = len(solution)
+    if game == "sudoku": metrics["steps"] = len(result[1])
+    return metrics
+
+class SolutionStore:
+    """
+    Precomputed solver results for every shipped level, keyed like SolverCache
+    (solver_digest of game, algorithm and the level's route payload), so a solve
+    request whose input matches a catalog level is answered without searching.
+    Entries live in a SQLite file written by one precompute process (see
+    start_precompute_process) and read by every web worker. A result depends only
+    on its digest, so workers keep the rows they have read in memory.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._memo = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = self.misses = 0
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS level_solutions (
+                digest TEXT PRIMARY KEY, game TEXT NOT NULL, difficulty TEXT NOT NULL, level TEXT NOT NULL,
+                algorithm TEXT NOT NULL, entry TEXT NOT NULL
+            )""")
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_level_solutions_level ON level_solutions (game, difficulty, level, algorithm)")
+        conn.execute("CREATE TABLE IF NOT EXISTS precompute_runs (id INTEGER PRIMARY KEY, run TEXT NOT NULL)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, game, algorithm, payload):
+        digest = solver_digest(game, algorithm, payload)
+        entry = self._memo.get(digest)
+        if entry is None:
+            row = self._connection().execute("SELECT entry FROM level_solutions WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                entry = json.loads(row[0])
+                with self._lock: self._memo[digest] = entry
+        with self._lock:
+            if entry is None: self.misses += 1
+            else: self.hits += 1
+        return entry["result"] if entry else None
+
+    def get_entry(self, game, difficulty, level, algorithm):
+        row = self._connection().execute("SELECT entry FROM level_solutions WHERE game = ? AND difficulty = ? AND level = ? AND algorithm = ?",
+                                         (game, difficulty, str(level), algorithm)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has(self, game, algorithm, payload):
+        row = self._connection().execute("SELECT 1 FROM level_solutions WHERE digest = ?", (solver_digest(game, algorithm, payload),)).fetchone()
+        return row is not None
+
+    def put(self, game, difficulty, level, algorithm, payload, result):
+        entry = {"game": game, "difficulty": difficulty, "level": str(level), "algorithm": algorithm,
+                 "result": result, "metrics": solution_metrics(game, result)}
+        # Replacing by level drops the row for the level's previous payload.
+        self._connection().execute("INSERT OR REPLACE INTO level_solutions (digest, game, difficulty, level, algorithm, entry) VALUES (?, ?, ?, ?, ?, ?)",
+                                   (solver_digest(game, algorithm, payload), game, difficulty, str(level), algorithm, json.dumps(entry)))
+
+    def discard_level(self, game, difficulty, level):
+        self._connection().execute("DELETE FROM level_solutions WHERE game = ? AND difficulty = ? AND level = ?", (game, difficulty, str(level)))
+
+    def precompute(self, catalog, games=None, only_level=None, processes=None, budget=120):
+        """
+        Solves every (level, algorithm) pair for `games` that is not already stored
+        for the level's current data, on a private SolverService, so each pair is
+        bounded by its per-algorithm time/node budget. Pairs not started within
+        `budget` seconds are skipped; anything not stored here keeps falling back
+        to live solving.
+        """
+        tasks = []
+        for game in games or SOLVERS:
+            for difficulty, levels in catalog.levels(game).items():
+                for level, level_data in levels.items():
+                    if only_level and (difficulty, str(level)) != (only_level[0], str(only_level[1])): continue
+                    payload = level_payload(game, level_data)
+                    for algorithm in SOLVERS[game]:
+                        tasks.append((game, difficulty, level, algorithm, payload))
+
+        started, deadline = time.monotonic(), time.monotonic() + budget
+
+        def solve(task):
+            game, difficulty, level, algorithm, payload = task
+            if self.has(game, algorithm, payload): return "stored"
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: return "skipped"
+            timeout = min(service.budget_for(game, algorithm)["timeout"], remaining)
+            outcome = service.solve(game, algorithm, payload, timeout=timeout)
+            if outcome["status"] == "ok": self.put(game, difficulty, level, algorithm, payload, outcome["result"])
+            return outcome["status"]
+
+        with SolverService(processes) as service, ThreadPoolExecutor(max_workers=service.processes) as executor:
+            statuses = Counter(executor.map(solve, tasks))
+        run = {"statuses": dict(statuses), "seconds": round(time.monotonic() - started, 3), "finished_at": time.time()}
+        self._connection().execute("INSERT INTO precompute_runs (run) VALUES (?)", (json.dumps(run),))
+        return run
+
+    def last_run(self):
+        row = self._connection().execute("SELECT run FROM precompute_runs ORDER BY id DESC LIMIT 1").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        solutions = self._connection().execute("SELECT COUNT(*) FROM level_solutions").fetchone()[0]
+        return {"solutions": solutions, "memo": len(self._memo), "hits": self.hits, "misses": self.misses, "last_run": self.last_run()}
+
+def start_precompute_process(db_path, budget=120, game=None, difficulty=None, level=None):
+    """
+    Runs this module as a detached process that fills `db_path`, so precompute
+    happens once per deployment (gunicorn on_starting, dev server) or once per
+    admin edit instead of once per web worker.
+    """
+    command = [sys.executable, os.path.abspath(__file__), db_path, "--budget", str(budget)]
+    if game: command += ["--game", game]
+    if difficulty is not None: command += ["--level", difficulty, str(level)]
+    return subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)), stdin=subprocess.DEVNULL, start_new_session=True)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute solver results for every shipped level.")
+    parser.add_argument("db_path", nargs="?", default=os.environ.get("SOLUTIONS_DB", "level_solutions.db"))
+    parser.add_argument("--budget", type=int, default=120, help="seconds before unstarted pairs are skipped")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--game", choices=sorted(SOLVERS))
+    parser.add_argument("--level", nargs=2, metavar=("DIFFICULTY", "LEVEL"))
+    args = parser.parse_args()
+    store = SolutionStore(args.db_path)
+    print(store.precompute(LevelCatalog(GAME_LEVEL_FILES), games=[args.game] if args.game else None,
+                           only_level=tuple(args.level) if args.level else None, processes=args.processes, budget=args.budget))
@@ -0,0 +1,257 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# A job moves queued -> running -> done | failed. Job records are plain dicts:
+# {"id", "status", "game", "algorithm", "payload", "meta", "submitted_at",
+#  "started_at", "finished_at", "result", "outcome", "attempts", "lease"}
+# A running job whose lease is not renewed in time (its worker died) goes back
+# to queued, or to failed once it has used up its attempts.
+
+def _new_job(game, algorithm, payload, meta):
+    return {"id": uuid.uuid4().hex, "status": "queued", "game": game, "algorithm": algorithm, "payload": payload,
+            "meta": meta or {}, "submitted_at": time.time(), "started_at": None, "finished_at": None,
+            "result": None, "outcome": None, "attempts": 0, "lease": None}
+
+# --- In-Process Broker ---
+class InProcessJobBroker:
+    """Jobs live in this worker's memory; only this worker can run or report them."""
+
+    def __init__(self, max_finished=1000):
+        self.max_finished = max_finished
+        self._pending = queue.Queue()
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, game, algorithm, payload, meta=None):
+        job = _new_job(game, algorithm, payload, meta)
+        with self._lock: self._jobs[job["id"]] = job
+        self._pending.put(job["id"])
+        return job["id"]
+
+    def claim(self, timeout=1.0):
+        try:
+            job_id = self._pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return None
+            job.update(status="running", started_at=time.time(), attempts=job["attempts"] + 1, lease=uuid.uuid4().hex)
+            return dict(job)
+
+    def heartbeat(self, job_id, lease):
+        """Jobs here die with the process that runs them, so there is no lease to renew."""
+        return True
+
+    def finish(self, job_id, status, result=None, outcome=None, lease=None):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None: return
+            job.update(status=status, finished_at=time.time(), result=result, outcome=outcome)
+            finished = [jid for jid, j in self._jobs.items() if j["status"] in ("done", "failed")]
+            for jid in finished[:max(0, len(finished) - self.max_finished)]: del self._jobs[jid]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+# --- Local Stand-In Broker ---
+class SqliteJobBroker:
+    """
+    A job table in a local SQLite file standing in for an external broker: every
+    gunicorn worker sharing the file can submit, claim and report any job.
+    Claims are atomic (IMMEDIATE transaction) and hand out a lease that the
+    runner renews every few seconds. A running job whose lease is older than
+    `lease_timeout` had its worker die: the next claim requeues it, or fails it
+    after `max_attempts`. Heartbeats and results from an expired lease are ignored.
+    """
+
+    def __init__(self, db_path, retention=3600, poll_interval=0.2, lease_timeout=60.0, max_attempts=2):
+        self.db_path = db_path
+        self.retention = retention
+        self.poll_interval = poll_interval
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS solve_jobs (
+                id TEXT PRIMARY KEY, status TEXT NOT NULL, job TEXT NOT NULL,
+                submitted_at REAL NOT NULL, finished_at REAL, lease TEXT, heartbeat_at REAL
+            )""")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(solve_jobs)")}
+        for column, kind in (("lease", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns: conn.execute(f"ALTER TABLE solve_jobs ADD COLUMN {column} {kind}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_solve_jobs_status ON solve_jobs (status, submitted_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_solve_jobs_heartbeat ON solve_jobs (status, heartbeat_at)")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, conn, job, heartbeat_at=None):
+        conn.execute("UPDATE solve_jobs SET status = ?, job = ?, finished_at = ?, lease = ?, heartbeat_at = ? WHERE id = ?",
+                     (job["status"], json.dumps(job), job["finished_at"], job["lease"], heartbeat_at, job["id"]))
+
+    def _expire_leases(self, conn):
+        """Requeues (or fails, after max_attempts) running jobs whose lease ran out. Call inside a transaction."""
+        now = time.time()
+        rows = conn.execute("SELECT job FROM solve_jobs WHERE status = 'running' AND heartbeat_at < ?", (now - self.lease_timeout,)).fetchall()
+        for (raw,) in rows:
+            job = json.loads(raw)
+            if job.get("attempts", 1) >= self.max_attempts:
+                job.update(status="failed", finished_at=now, lease=None,
+                           outcome={"status": "lost", "message": f"Solver worker stopped responding ({job['attempts']} attempts)."})
+            else:
+                job.update(status="queued", started_at=None, lease=None)
+            self._write(conn, job)
+
+    def submit(self, game, algorithm, payload, meta=None):
+        job = _new_job(game, algorithm, payload, meta)
+        self._connection().execute("INSERT INTO solve_jobs (id, status, job, submitted_at) VALUES (?, ?, ?, ?)",
+                                   (job["id"], job["status"], json.dumps(job), job["submitted_at"]))
+        return job["id"]
+
+    def claim(self, timeout=1.0):
+        deadline = time.monotonic() + timeout
+        conn = self._connection()
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._expire_leases(conn)
+                row = conn.execute("SELECT job FROM solve_jobs WHERE status = 'queued' ORDER BY submitted_at LIMIT 1").fetchone()
+                job = None
+                if row:
+                    job = json.loads(row[0])
+                    job.update(status="running", started_at=time.time(), attempts=job.get("attempts", 0) + 1, lease=uuid.uuid4().hex)
+                    self._write(conn, job, heartbeat_at=job["started_at"])
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            if job or time.monotonic() >= deadline: return job
+            time.sleep(self.poll_interval)
+
+    def heartbeat(self, job_id, lease):
+        """Renews a running job's lease; False if the lease has expired and the job was handed on."""
+        cursor = self._connection().execute("UPDATE solve_jobs SET heartbeat_at = ? WHERE id = ? AND status = 'running' AND lease = ?",
+                                            (time.time(), job_id, lease))
+        return cursor.rowcount == 1
+
+    def finish(self, job_id, status, result=None, outcome=None, lease=None):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            job = self.get(job_id)
+            current = job is not None and (lease is None or (job["status"] == "running" and job["lease"] == lease))
+            if current:
+                job.update(status=status, finished_at=time.time(), result=result, outcome=outcome, lease=None)
+                self._write(conn, job)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        if current: conn.execute("DELETE FROM solve_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (time.time() - self.retention,))
+
+    def get(self, job_id):
+        row = self._connection().execute("SELECT job FROM solve_jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+# --- Job Runner ---
+class SolveJobs:
+    """
+    Runs queued solve jobs on background threads. `solve(game, algorithm, payload)`
+    returns the route result or raises; `on_done(job, result)` runs after success
+    (e.g. to record progress for the submitting user). While jobs run, one more
+    thread renews their broker leases every `heartbeat_interval` seconds.
+    """
+
+    def __init__(self, broker, solve, on_done=None, workers=2, heartbeat_interval=10.0):
+        self.broker = broker
+        self.solve = solve
+        self.on_done = on_done
+        self.workers = workers
+        self.heartbeat_interval = heartbeat_interval
+        self._threads = []
+        self._running = {}
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def start(self):
+        with self._start_lock:
+            if self._threads: return
+            for target in [self._run] * self.workers + [self._renew_leases]:
+                thread = threading.Thread(target=target, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _renew_leases(self):
+        while not self._stopping.wait(self.heartbeat_interval):
+            for job_id, lease in list(self._running.items()):
+                try:
+                    self.broker.heartbeat(job_id, lease)
+                except Exception:
+                    logger.exception("heartbeat failed for solve job %s", job_id)
+
+    def stop(self):
+        self._stopping.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            job = self.broker.claim(timeout=1.0)
+            if job is None: continue
+            self._running[job["id"]] = job["lease"]
+            try:
+                result = self.solve(job["game"], job["algorithm"], job["payload"])
+            except Exception as exc:
+                outcome = getattr(exc, "outcome", {"status": "error", "message": f"{type(exc).__name__}: {exc}"})
+                self.broker.finish(job["id"], "failed", outcome=outcome, lease=job["lease"])
+                continue
+            finally:
+                self._running.pop(job["id"], None)
+            self.broker.finish(job["id"], "done", result=result, lease=job["lease"])
+            if self.on_done:
+                try:
+                    self.on_done(job, result)
+                except Exception:
+                    logger.exception("on_done failed for solve job %s", job["id"])
+
+    def submit(self, game, algorithm, payload, meta=None):
+        self.start()
+        return self.broker.submit(game, algorithm, payload, meta)
+
+    def status(self, job_id):
+        return self.broker.get(job_id)
+
+    def watch(self, job_id, poll_interval=0.2, heartbeat=15.0):
+        """Yields the job each time its status changes (None as a heartbeat) until it finishes."""
+        last_status, last_sent = None, time.monotonic()
+        while True:
+            job = self.broker.get(job_id)
+            if job is None: return
+            if job["status"] != last_status:
+                last_status, last_sent = job["status"], time.monotonic()
+                yield job
+                if job["status"] in ("done", "failed"): return
+            elif time.monotonic() - last_sent >= heartbeat:
+                last_sent = time.monotonic()
+                yield None
+            time.sleep(poll_interval)
+
+def create_job_broker(backend, db_path):
+    if backend == "memory": return InProcessJobBroker()
+    if backend == "sqlite": return SqliteJobBroker(db_path)
+    raise ValueError(f"Unknown job broker: {backend}")
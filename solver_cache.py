@@ -0,0 +1,92 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+def solver_digest(game, algorithm, payload):
+    """Canonical key for a solve: identical inputs hash the same regardless of dict key order."""
+    canonical = json.dumps([game, algorithm, payload], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class SolverCache:
+    """
+    Bounded LRU of solver results keyed by solver_digest(game, algorithm, input).
+    With `persist_path` set, entries are also written to a small SQLite table so
+    they survive restarts and are shared between workers.
+    Cached results are shared objects and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=512, persist_path=None):
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.hits = self.misses = self.evictions = self.disk_hits = 0
+        if persist_path:
+            self._disk().execute("CREATE TABLE IF NOT EXISTS solver_cache (digest TEXT PRIMARY KEY, game TEXT NOT NULL, result TEXT NOT NULL)")
+
+    def _disk(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.persist_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _remember(self, digest, game, result):
+        with self._lock:
+            self._entries[digest] = (game, result)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get(self, game, algorithm, payload):
+        digest = solver_digest(game, algorithm, payload)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return entry[1]
+        if self.persist_path:
+            row = self._disk().execute("SELECT result FROM solver_cache WHERE digest = ?", (digest,)).fetchone()
+            if row:
+                result = json.loads(row[0])
+                self._remember(digest, game, result)
+                with self._lock:
+                    self.hits += 1
+                    self.disk_hits += 1
+                return result
+        with self._lock: self.misses += 1
+        return None
+
+    def put(self, game, algorithm, payload, result):
+        digest = solver_digest(game, algorithm, payload)
+        self._remember(digest, game, result)
+        if self.persist_path:
+            self._disk().execute("INSERT OR REPLACE INTO solver_cache (digest, game, result) VALUES (?, ?, ?)",
+                                 (digest, game, json.dumps(result)))
+
+    def get_or_solve(self, game, algorithm, payload, solve):
+        """Returns (result, cached) where `solve()` is only called on a miss."""
+        result = self.get(game, algorithm, payload)
+        if result is not None: return result, True
+        result = solve()
+        self.put(game, algorithm, payload, result)
+        return result, False
+
+    def invalidate(self, game=None):
+        with self._lock:
+            if game is None: self._entries.clear()
+            else:
+                for digest in [d for d, (g, _) in self._entries.items() if g == game]: del self._entries[digest]
+        if self.persist_path:
+            if game is None: self._disk().execute("DELETE FROM solver_cache")
+            else: self._disk().execute("DELETE FROM solver_cache WHERE game = ?", (game,))
+
+    def stats(self):
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions, "disk_hits": self.disk_hits}
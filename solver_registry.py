@@ -0,0 +1,67 @@
+import time
+from functools import partial
+
+from maze_solver import dfs_solver, bfs_solver, astar_solver, greedy_solver, bidirectional_bfs_solver, jps_solver
+from puzzle_solver import solve_puzzle_astar, solve_puzzle_bfs, solve_puzzle_iddfs, solve_puzzle_idastar
+from sudoku_solver import solve_sudoku_dfs, solve_sudoku_astar, solve_sudoku_ac3, iter_sudoku_dfs, iter_sudoku_ac3
+from sudoku_dlx import solve_sudoku_dlx
+from word_search_solver import solve_word_search_simple, solve_word_search_trie, solve_word_search_aho
+from memory_solver import solve_memory_dfs, solve_memory_astar, solve_memory_greedy
+from pattern_lock_solver import solve_pattern_lock_dfs, solve_pattern_lock_bfs, solve_pattern_lock_astar, solve_pattern_lock_greedy
+
+# Every solver takes the route's canonical payload and returns the tuple the route
+# sends back: (solution, ai_time) for most games, (solution, steps, ai_time) for sudoku
+# and (solution, nodes_expanded, ai_time) for maze.
+
+def _timed(solver):
+    def run(maze, **options):
+        stats = {}
+        start = time.perf_counter()
+        solution = solver(maze, stats=stats, **options)
+        return solution, stats.get("nodes"), f"{time.perf_counter() - start:.12f}"
+    return run
+
+def _grid_and_words(solver):
+    def run(payload, **options):
+        return solver(payload['grid'], payload['words'], **options)
+    return run
+
+# Ordered roughly cheapest game first, so precompute finishes the fast levels before the slow searches.
+SOLVERS = {
+    "maze": {"DFS": _timed(dfs_solver), "BFS": _timed(bfs_solver), "A*": _timed(astar_solver), "Greedy": _timed(greedy_solver),
+             "Bi-BFS": _timed(bidirectional_bfs_solver), "JPS": _timed(jps_solver)},
+    "word_search": {"Simple": _grid_and_words(solve_word_search_simple), "Trie": _grid_and_words(solve_word_search_trie),
+                    "Aho-Corasick": _grid_and_words(solve_word_search_aho)},
+    "pattern_lock": {"DFS": solve_pattern_lock_dfs, "BFS": solve_pattern_lock_bfs, "A*": solve_pattern_lock_astar, "Greedy": solve_pattern_lock_greedy},
+    "memory": {"DFS": solve_memory_dfs, "A*": solve_memory_astar, "Greedy": solve_memory_greedy},
+    "puzzle": {"BFS": solve_puzzle_bfs, "IDDFS": partial(solve_puzzle_iddfs, table_size=250_000), "A*": solve_puzzle_astar, "IDA*": solve_puzzle_idastar},
+    "sudoku": {"DFS": solve_sudoku_dfs, "A*": solve_sudoku_astar, "AC-3": solve_sudoku_ac3, "DLX": solve_sudoku_dlx},
+}
+
+def level_payload(game, level_data):
+    """Maps a catalog level to the payload the matching solve route receives."""
+    if game == "word_search": return {"grid": level_data['grid'], "words": sorted(level_data['words'])}
+    return level_data
+
+def run_solver(game, algorithm, payload, **options):
+    """Module-level entry point so worker processes can look solvers up by name."""
+    return SOLVERS[game][algorithm](payload, **options)
+
+# Solvers that can also run as generators of search events (see sudoku_solver).
+# Every stream ends with exactly one final event.
+EVENT_STREAMS = {("sudoku", "DFS"): iter_sudoku_dfs, ("sudoku", "AC-3"): iter_sudoku_ac3}
+FINAL_EVENTS = ("solved", "failed", "timeout", "budget_exceeded", "busy", "error")
+
+def decimate_events(events, every=1, types=None):
+    """Passes every `every`-th event whose type is in `types`; final events always pass."""
+    kept = 0
+    for event in events:
+        if event["type"] in FINAL_EVENTS:
+            yield event
+            continue
+        if types and event["type"] not in types: continue
+        kept += 1
+        if (kept - 1) % every == 0: yield event
+
+def run_event_stream(game, algorithm, payload, every=1, types=None, **options):
+    return decimate_events(EVENT_STREAMS[(game, algorithm)](payload, **options), every, types)
@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+from search_budget import SearchBudgetExceeded
+from solver_registry import run_event_stream, run_solver
+
+# Per-(game, algorithm) limits. `timeout` is wall-clock seconds; `max_nodes` is passed
+# to solvers that count expansions and makes them stop with SearchBudgetExceeded.
+DEFAULT_BUDGET = {"timeout": 10.0}
+ALGORITHM_BUDGETS = {
+    ("puzzle", "BFS"): {"timeout": 10.0, "max_nodes": 500_000},
+    ("puzzle", "IDDFS"): {"timeout": 15.0, "max_nodes": 8_000_000},
+    ("puzzle", "A*"): {"timeout": 10.0, "max_nodes": 500_000},
+    ("puzzle", "IDA*"): {"timeout": 30.0, "max_nodes": 5_000_000},
+    ("sudoku", "DFS"): {"timeout": 10.0, "max_nodes": 2_000_000},
+    ("sudoku", "A*"): {"timeout": 10.0, "max_nodes": 200_000},
+    ("sudoku", "AC-3"): {"timeout": 10.0, "max_nodes": 2_000_000},
+    ("sudoku", "DLX"): {"timeout": 10.0, "max_nodes": 2_000_000},
+    ("memory", "A*"): {"timeout": 10.0, "max_nodes": 200_000},
+}
+
+class SolveFailed(Exception):
+    """Raised to a route when a solve timed out, ran out of nodes, or crashed."""
+
+    def __init__(self, outcome):
+        super().__init__(outcome.get("message", outcome["status"]))
+        self.outcome = outcome
+
+# Streamed events are sent in batches, flushed at least this often so the first frames arrive at once.
+EVENT_FLUSH_SECONDS = 0.05
+EVENT_BATCH_SIZE = 512
+
+def _send_events(conn, events):
+    batch, flushed = [], time.perf_counter()
+    for event in events:
+        batch.append(event)
+        if len(batch) >= EVENT_BATCH_SIZE or time.perf_counter() - flushed >= EVENT_FLUSH_SECONDS:
+            conn.send(("events", batch))
+            batch, flushed = [], time.perf_counter()
+    if batch: conn.send(("events", batch))
+
+def _worker_loop(conn):
+    while True:
+        try:
+            game, algorithm, payload, options, stream = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            if stream is None:
+                conn.send(("ok", run_solver(game, algorithm, payload, **options)))
+            else:
+                _send_events(conn, run_event_stream(game, algorithm, payload, **stream, **options))
+                conn.send(("ok", None))
+        except SearchBudgetExceeded as exc:
+            conn.send(("budget_exceeded", {"nodes": exc.nodes, "partial": exc.partial}))
+        except Exception as exc:
+            conn.send(("error", {"message": f"{type(exc).__name__}: {exc}"}))
+
+class SolverService:
+    """
+    A fixed pool of solver processes, so CPU-bound searches run outside the web
+    worker and off its GIL. Each solve gets one idle process; if it outlives its
+    time budget the process is killed (the only way to cancel a running search)
+    and replaced with a fresh one.
+    """
+
+    def __init__(self, processes=None, budgets=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.budgets = dict(ALGORITHM_BUDGETS if budgets is None else budgets)
+        self._context = multiprocessing.get_context("fork")
+        self._idle = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self.completed = self.timed_out = self.budget_exceeded = self.errors = self.busy = 0
+
+    def _spawn(self):
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        worker = (process, parent_conn)
+        with self._lock: self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker):
+        process, conn = worker
+        with self._lock: self._workers.discard(worker)
+        if process.is_alive(): process.kill()
+        process.join()
+        conn.close()
+
+    def _ensure_started(self):
+        if self._started: return
+        with self._lock:
+            if self._started: return
+            self._started = True
+        for _ in range(self.processes): self._idle.put(self._spawn())
+
+    def budget_for(self, game, algorithm):
+        return {**DEFAULT_BUDGET, **self.budgets.get((game, algorithm), {})}
+
+    def solve(self, game, algorithm, payload, timeout=None, max_nodes=None):
+        """
+        Returns an outcome dict with "status" set to one of:
+        ok (with "result"), timeout, budget_exceeded (with "nodes"/"partial"), busy, or error.
+        """
+        budget = self.budget_for(game, algorithm)
+        timeout = budget["timeout"] if timeout is None else timeout
+        max_nodes = budget.get("max_nodes") if max_nodes is None else max_nodes
+        options = {"max_nodes": max_nodes} if max_nodes is not None else {}
+        self._ensure_started()
+        started = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            self.busy += 1
+            return {"status": "busy", "elapsed": time.perf_counter() - started, "message": "All solver processes are busy."}
+
+        process, conn = worker
+        try:
+            conn.send((game, algorithm, payload, options, None))
+            remaining = timeout - (time.perf_counter() - started)
+            if not conn.poll(max(0.0, remaining)):
+                self._retire(worker)
+                worker = self._spawn()
+                self.timed_out += 1
+                return {"status": "timeout", "elapsed": time.perf_counter() - started, "budget": {"timeout": timeout, "max_nodes": max_nodes},
+                        "message": f"{algorithm} did not finish within {timeout:g}s."}
+            status, value = conn.recv()
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            self._retire(worker)
+            worker = self._spawn()
+            self.errors += 1
+            return {"status": "error", "elapsed": time.perf_counter() - started, "message": f"Solver process failed: {exc!r}"}
+        finally:
+            self._idle.put(worker)
+
+        elapsed = time.perf_counter() - started
+        if status == "ok":
+            self.completed += 1
+            return {"status": "ok", "result": value, "elapsed": elapsed}
+        if status == "budget_exceeded":
+            self.budget_exceeded += 1
+            return {"status": "budget_exceeded", "elapsed": elapsed, "budget": {"timeout": timeout, "max_nodes": max_nodes},
+                    "message": f"{algorithm} gave up after expanding {value['nodes']} nodes.", **value}
+        self.errors += 1
+        return {"status": "error", "elapsed": elapsed, **value}
+
+    def stream(self, game, algorithm, payload, every=1, types=None, timeout=None, max_nodes=None):
+        """
+        Yields the search events of a solver in solver_registry.EVENT_STREAMS as a
+        worker process produces them, decimated in the worker. The last event is
+        final: solved/failed, or timeout, budget_exceeded, busy or error. The worker
+        blocks while the consumer falls behind; if the consumer stops early or the
+        time budget runs out, the worker is killed and replaced.
+        """
+        budget = self.budget_for(game, algorithm)
+        timeout = budget["timeout"] if timeout is None else timeout
+        max_nodes = budget.get("max_nodes") if max_nodes is None else max_nodes
+        options = {"max_nodes": max_nodes} if max_nodes is not None else {}
+        self._ensure_started()
+        started = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            self.busy += 1
+            yield {"type": "busy", "message": "All solver processes are busy."}
+            return
+
+        process, conn = worker
+        finished = False
+        try:
+            conn.send((game, algorithm, payload, options, {"every": every, "types": types}))
+            while True:
+                remaining = timeout - (time.perf_counter() - started)
+                if remaining <= 0 or not conn.poll(remaining):
+                    self.timed_out += 1
+                    yield {"type": "timeout", "budget": {"timeout": timeout, "max_nodes": max_nodes}}
+                    return
+                status, value = conn.recv()
+                if status == "events":
+                    yield from value
+                    continue
+                finished = True
+                if status == "ok":
+                    self.completed += 1
+                elif status == "budget_exceeded":
+                    self.budget_exceeded += 1
+                    yield {"type": "budget_exceeded", "nodes": value["nodes"], "budget": {"timeout": timeout, "max_nodes": max_nodes}}
+                else:
+                    self.errors += 1
+                    yield {"type": "error", "message": value["message"]}
+                return
+        except (EOFError, OSError, BrokenPipeError) as exc:
+            self.errors += 1
+            yield {"type": "error", "message": f"Solver process failed: {exc!r}"}
+        finally:
+            if not finished:
+                self._retire(worker)
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def shutdown(self):
+        with self._lock: workers = list(self._workers)
+        for worker in workers: self._retire(worker)
+        self._started = False
+        self._idle = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def stats(self):
+        return {"processes": self.processes, "idle": self._idle.qsize(), "completed": self.completed, "timed_out": self.timed_out,
+                "budget_exceeded": self.budget_exceeded, "busy": self.busy, "errors": self.errors}
@@ -0,0 +1,49 @@
+// Reads a streamed solve (/stream_solve/<game>, NDJSON) and calls onEvent for each
+// search event as soon as its line arrives. Resolves with the final event.
+async function streamSearchEvents(url, body, onEvent) {
+  const res = await fetch(url, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body)
+  });
+  if (!res.ok) {
+    const error = await res.json().catch(() => ({}));
+    throw new Error(error.message || `Stream failed (${res.status})`);
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffered = '', last = null;
+  while (true) {
+    const { value, done } = await reader.read();
+    buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+    const lines = buffered.split('\n');
+    buffered = lines.pop();
+    for (const line of lines) {
+      if (!line) continue;
+      last = JSON.parse(line);
+      onEvent(last);
+    }
+    if (done) return last;
+  }
+}
+
+// Plays queued events at a steady pace: one tick every `msPerTick`, draining more
+// events per tick when the backlog grows so long searches still finish.
+function createEventPlayer(applyEvent, msPerTick = 20) {
+  const queue = [];
+  let timer = null;
+  function tick() {
+    const count = Math.max(1, Math.ceil(queue.length / 100));
+    for (let i = 0; i < count && queue.length; i++) applyEvent(queue.shift());
+    if (!queue.length) { clearInterval(timer); timer = null; }
+  }
+  return {
+    push(event) {
+      queue.push(event);
+      if (timer) return;
+      timer = setInterval(tick, msPerTick);
+      tick();
+    },
+    stop() { queue.length = 0; if (timer) clearInterval(timer); timer = null; }
+  };
+}
@@ -0,0 +1,240 @@
+"""
+Dancing Links (Knuth's Algorithm X) for Sudoku as exact cover: 729 candidate rows
+(cell, value), each covering 4 of 324 columns (cell filled, value in row, value in
+column, value in box). The links are flat integer lists rather than node objects;
+the empty structure is built once at import and copied per board.
+
+Batch mode reads one board per line (81 characters, '0' or '.' for blanks):
+
+    python sudoku_dlx.py puzzles.txt --out solved.txt      # '-' reads stdin
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+
+from search_budget import SearchBudgetExceeded, check_budget
+
+COLUMNS = 324
+ROOT = 0
+
+def _row_columns(r, c, v):
+    """1-based header indexes of the four constraints (cell, row, column, box) a placement covers."""
+    return (1 + r * 9 + c, 82 + r * 9 + v, 163 + c * 9 + v, 244 + ((r // 3) * 3 + c // 3) * 9 + v)
+
+def _build_links():
+    """Links for the full, uncovered matrix. Node 0 is the root, 1..324 the headers, then 4 nodes per row."""
+    left = list(range(-1, COLUMNS)); left[0] = COLUMNS
+    right = list(range(1, COLUMNS + 2)); right[COLUMNS] = 0
+    up, down, column = list(range(COLUMNS + 1)), list(range(COLUMNS + 1)), list(range(COLUMNS + 1))
+    row_of, first_node = [-1] * (COLUMNS + 1), []
+    for row in range(729):
+        (r, c), v = divmod(row // 9, 9), row % 9
+        first = len(column)
+        first_node.append(first)
+        for k, col in enumerate(_row_columns(r, c, v)):
+            node = first + k
+            left.append(first + (k + 3) % 4)
+            right.append(first + (k + 1) % 4)
+            up.append(up[col]); down.append(col)
+            down[up[col]] = node
+            up[col] = node
+            column.append(col)
+            row_of.append(row)
+    return left, right, up, down, column, row_of, tuple(first_node)
+
+_LEFT, _RIGHT, _UP, _DOWN, _COLUMN, ROW_OF_NODE, FIRST_NODE = _build_links()
+
+class DancingLinks:
+    """One board's exact-cover matrix: givens are selected up front, the search fills the rest."""
+    __slots__ = ("left", "right", "up", "down", "size", "givens", "consistent")
+
+    def __init__(self, board):
+        self.left, self.right, self.up, self.down = _LEFT[:], _RIGHT[:], _UP[:], _DOWN[:]
+        self.size = [9] * (COLUMNS + 1)
+        self.givens, self.consistent = [], True
+        covered = bytearray(COLUMNS + 1)
+        for r in range(9):
+            for c in range(9):
+                v = board[r][c]
+                if not v: continue
+                node = FIRST_NODE[(r * 9 + c) * 9 + v - 1]
+                cols = _row_columns(r, c, v - 1)
+                if any(covered[col] for col in cols):
+                    self.consistent = False
+                    return
+                for col in cols:
+                    covered[col] = 1
+                self.cover(_COLUMN[node])
+                self._select_rest(node)
+                self.givens.append(node)
+
+    def cover(self, col):
+        left, right, up, down, size = self.left, self.right, self.up, self.down, self.size
+        right[left[col]], left[right[col]] = right[col], left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]], up[down[j]] = down[j], up[j]
+                size[_COLUMN[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, col):
+        left, right, up, down, size = self.left, self.right, self.up, self.down, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[_COLUMN[j]] += 1
+                down[up[j]] = up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = left[right[col]] = col
+
+    def _select_rest(self, node):
+        j = self.right[node]
+        while j != node:
+            self.cover(_COLUMN[j])
+            j = self.right[j]
+
+    def _deselect_rest(self, node):
+        j = self.left[node]
+        while j != node:
+            self.uncover(_COLUMN[j])
+            j = self.left[j]
+
+    def _smallest_column(self):
+        right, size = self.right, self.size
+        best, col = ROOT, right[ROOT]
+        best_size = 10
+        while col != ROOT:
+            if size[col] < best_size:
+                best, best_size = col, size[col]
+                if best_size <= 1: break
+            col = right[col]
+        return best
+
+    def search(self, limit=1, max_nodes=None):
+        """
+        Algorithm X with an explicit stack, always branching on the column with the
+        fewest rows left. Returns up to `limit` solutions, each the list of chosen
+        candidate rows (row = (r * 9 + c) * 9 + value - 1) in the order chosen.
+        """
+        if not self.consistent: return []
+        solutions, stack, nodes = [], [], 0
+        down, column = self.down, _COLUMN
+        advance = True
+        while True:
+            if advance:
+                if self.right[ROOT] == ROOT:
+                    solutions.append([ROW_OF_NODE[node] for node in stack])
+                    if len(solutions) >= limit: break
+                else:
+                    nodes += 1
+                    check_budget(nodes, max_nodes)
+                    col = self._smallest_column()
+                    if self.size[col]:
+                        self.cover(col)
+                        stack.append(down[col])
+                        self._select_rest(stack[-1])
+                        continue
+            advance = False
+            while stack:
+                node = stack.pop()
+                self._deselect_rest(node)
+                col, node = column[node], down[node]
+                if node != col:
+                    stack.append(node)
+                    self._select_rest(node)
+                    advance = True
+                    break
+                self.uncover(col)
+            if not advance: break
+        return solutions
+
+def _apply_rows(board, rows):
+    solved = [row[:] for row in board]
+    for row in rows:
+        cell, value = divmod(row, 9)
+        solved[cell // 9][cell % 9] = value + 1
+    return solved
+
+def solve_sudoku_dlx(board, max_nodes=None):
+    """(solution, steps, ai_time) like the other Sudoku solvers; steps place the filled cells in search order."""
+    start_time = time.perf_counter()
+    solutions = DancingLinks(board).search(limit=1, max_nodes=max_nodes)
+    elapsed = time.perf_counter() - start_time
+    if not solutions: return (None, [], f"{elapsed:.12f}")
+    steps = [{"pos": divmod(row // 9, 9), "val": row % 9 + 1, "type": "place"} for row in solutions[0]]
+    return (_apply_rows(board, solutions[0]), steps, f"{elapsed:.12f}")
+
+def count_solutions(board, limit=2, max_nodes=None):
+    """Number of solutions, stopping at `limit`: 1 means the puzzle is valid and unique."""
+    return len(DancingLinks(board).search(limit=limit, max_nodes=max_nodes))
+
+# --- Batch Mode ---
+def parse_board(line):
+    text = line.strip().replace(".", "0")
+    if len(text) != 81 or not text.isdigit(): raise ValueError(f"not an 81-cell board: {line.strip()[:40]!r}")
+    return [[int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+
+def format_board(board):
+    return "".join(str(v) for row in board for v in row)
+
+def solve_many(lines, max_nodes=None):
+    """
+    Yields (line_number, board, solution, status) for every non-blank line of a file
+    or stream. status is "solved", "unsolved" (no solution), "over_budget" (more than
+    `max_nodes` nodes) or "invalid" (a malformed line, with board None and the reason
+    as solution); a failing board never stops the rest of the batch.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip(): continue
+        try:
+            board = parse_board(line)
+        except ValueError as exc:
+            yield line_number, None, str(exc), "invalid"
+            continue
+        try:
+            solutions = DancingLinks(board).search(limit=1, max_nodes=max_nodes)
+        except SearchBudgetExceeded:
+            yield line_number, board, None, "over_budget"
+            continue
+        if solutions: yield line_number, board, _apply_rows(board, solutions[0]), "solved"
+        else: yield line_number, board, None, "unsolved"
+
+def run_batch(lines, max_nodes=None, out=None, errors=None):
+    """
+    Solves every board in `lines`, optionally writing solutions to `out` (one line per
+    board, '' if none) and a line per invalid board to `errors`, and reports counts by
+    status and throughput.
+    """
+    counts = Counter()
+    start_time = time.perf_counter()
+    for line_number, _, solution, status in solve_many(lines, max_nodes):
+        counts[status] += 1
+        if out is not None: out.write((format_board(solution) if status == "solved" else "") + "\n")
+        if errors is not None and status == "invalid": errors.write(f"line {line_number}: {solution}\n")
+    elapsed = time.perf_counter() - start_time
+    boards = sum(counts.values())
+    return {"boards": boards, "solved": counts["solved"], "unsolved": counts["unsolved"], "over_budget": counts["over_budget"],
+            "invalid": counts["invalid"], "seconds": round(elapsed, 6), "boards_per_second": round(boards / elapsed, 1) if elapsed else None}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="file with one board per line, or - for stdin")
+    parser.add_argument("--out", help="write one solution per line here")
+    parser.add_argument("--max-nodes", type=int, default=None, help="search budget per board")
+    args = parser.parse_args()
+    source = sys.stdin if args.path == "-" else open(args.path)
+    out = open(args.out, "w") if args.out else None
+    try:
+        report = run_batch(source, args.max_nodes, out, errors=sys.stderr)
+    finally:
+        if out: out.close()
+        if source is not sys.stdin: source.close()
+    print(f"{report['boards']} boards, {report['solved']} solved, {report['unsolved']} unsolved, "
+          f"{report['over_budget']} over budget, {report['invalid']} invalid "
+          f"in {report['seconds']:.3f}s ({report['boards_per_second']} boards/s)")
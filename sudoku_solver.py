@@ -1,192 +1,403 @@
 import time
 import heapq
+from array import array
+from collections import deque
+from search_budget import SearchBudgetExceeded, check_budget
 
-# --- Common Helper Functions ---
-def is_valid(board, row, col, num):
-    for x in range(9):
-        if board[row][x] == num or board[x][col] == num:
-            return False
-    start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-    for i in range(3):
-        for j in range(3):
-            if board[i + start_row][j + start_col] == num:
-                return False
-    return True
-
-def find_empty(board):
-    for i in range(9):
-        for j in range(9):
-            if board[i][j] == 0:
-                return (i, j)
-    return None
+# --- Bitmask Engine ---
+# Cells are indexed r * 9 + c. Each row, column and box keeps a bitmask of the values
+# it already holds (bit v for value v), updated on every place/clear, so a validity
+# check or a cell's candidate set is three ORs instead of a 27-cell rescan.
+ALL_VALUES = 0b1111111110
+ROW_OF = tuple(i // 9 for i in range(81))
+COL_OF = tuple(i % 9 for i in range(81))
+BOX_OF = tuple((i // 27) * 3 + (i % 9) // 3 for i in range(81))
+UNITS = tuple(tuple(i for i in range(81) if ROW_OF[i] == u) for u in range(9)) + \
+        tuple(tuple(i for i in range(81) if COL_OF[i] == u) for u in range(9)) + \
+        tuple(tuple(i for i in range(81) if BOX_OF[i] == u) for u in range(9))
+PEERS = tuple(tuple(j for j in range(81) if j != i and (ROW_OF[j] == ROW_OF[i] or COL_OF[j] == COL_OF[i] or BOX_OF[j] == BOX_OF[i]))
+              for i in range(81))
+VALUES_OF = tuple(tuple(v for v in range(1, 10) if mask >> v & 1) for mask in range(1 << 10))
+
+class SudokuState:
+    """
+    A board as 81 cell values plus per-unit value masks and the list of empty
+    cells (`slot[i]` is cell i's index in `empties`), all kept current by
+    place/clear so nothing rescans the full board.
+    """
+    __slots__ = ("cells", "rows", "cols", "boxes", "empties", "slot")
+
+    def __init__(self, cells):
+        self.cells = bytearray(cells)
+        self.rows, self.cols, self.boxes = [0] * 9, [0] * 9, [0] * 9
+        self.empties, self.slot = [], bytearray(81)
+        for i, value in enumerate(self.cells):
+            if value:
+                bit = 1 << value
+                self.rows[ROW_OF[i]] |= bit
+                self.cols[COL_OF[i]] |= bit
+                self.boxes[BOX_OF[i]] |= bit
+            else:
+                self.slot[i] = len(self.empties)
+                self.empties.append(i)
+
+    @classmethod
+    def from_board(cls, board):
+        return cls(value for row in board for value in row)
+
+    def candidates(self, i):
+        return ALL_VALUES & ~(self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]])
+
+    def can_place(self, i, value):
+        return not (self.rows[ROW_OF[i]] | self.cols[COL_OF[i]] | self.boxes[BOX_OF[i]]) >> value & 1
+
+    def place(self, i, value):
+        bit = 1 << value
+        self.cells[i] = value
+        self.rows[ROW_OF[i]] |= bit
+        self.cols[COL_OF[i]] |= bit
+        self.boxes[BOX_OF[i]] |= bit
+        last = self.empties.pop()
+        if last != i:
+            self.empties[self.slot[i]] = last
+            self.slot[last] = self.slot[i]
+
+    def clear(self, i):
+        bit = ~(1 << self.cells[i])
+        self.cells[i] = 0
+        self.rows[ROW_OF[i]] &= bit
+        self.cols[COL_OF[i]] &= bit
+        self.boxes[BOX_OF[i]] &= bit
+        self.slot[i] = len(self.empties)
+        self.empties.append(i)
+
+    def mrv_cell(self):
+        """The empty cell with the fewest candidates (ties to the lowest index), or None if the board is full."""
+        best, best_count = None, 10
+        for i in self.empties:
+            count = self.candidates(i).bit_count()
+            if count < best_count or (count == best_count and i < best):
+                best, best_count = i, count
+                if count == 0: break
+        return best
+
+    def fill_singles(self, placed):
+        """
+        Places naked singles (a cell with one candidate) and hidden singles (a value
+        with one possible cell in a unit) until none are left, appending each cell
+        placed to `placed`. Returns False as soon as a cell or a unit runs out of options.
+        """
+        cells, candidates = self.cells, self.candidates
+        while True:
+            singles = []
+            for i in self.empties:
+                mask = candidates(i)
+                if not mask: return False
+                if mask & (mask - 1) == 0: singles.append((i, mask))
+            if singles:
+                for i, mask in singles:
+                    if not candidates(i) & mask: return False
+                    self.place(i, mask.bit_length() - 1)
+                    placed.append(i)
+                continue
+            progress = False
+            for unit in UNITS:
+                once = twice = filled = 0
+                for cell in unit:
+                    if cells[cell]:
+                        filled |= 1 << cells[cell]
+                    else:
+                        mask = candidates(cell)
+                        twice |= once & mask
+                        once |= mask
+                if once | filled != ALL_VALUES: return False
+                hidden = once & ~twice
+                if not hidden: continue
+                for cell in unit:
+                    if cells[cell]: continue
+                    mask = candidates(cell) & hidden
+                    if not mask: continue
+                    if mask & (mask - 1): return False
+                    self.place(cell, mask.bit_length() - 1)
+                    placed.append(cell)
+                    progress = True
+            if not progress: return True
+
+    def board(self):
+        return [list(self.cells[r * 9:r * 9 + 9]) for r in range(9)]
+
+# --- Event Streams ---
+# The DFS and AC-3 solvers are generators of search events, so callers can stream
+# them (see /stream_solve/sudoku) instead of holding the whole trace in memory:
+#   {"type": "expand", "pos": (r, c)}              a search node chose its cell
+#   {"type": "enqueue", "pos": (r, c), "vals": [...]}  its child nodes, in the order they are tried
+#   {"type": "place", "pos": (r, c), "val": v}     a value was tried
+#   {"type": "backtrack", "pos": (r, c), "val": 0} a value was undone
+#   {"type": "solved", "board": [...]} / {"type": "failed"}   always last
+TRACE_EVENTS = ("place", "backtrack")
+
+def _iter_backtracking(board_copy, max_nodes=None):
+    """
+    Iterative backtracking with forward checking: after every choice the board is
+    filled with its naked and hidden singles, and a choice that leaves some cell or
+    unit without options is dropped before it is shown. Branches on the empty cell
+    with the fewest candidates (MRV, ties to the lowest index), trying values in
+    ascending order. Cells fixed by a choice are placed right after it and undone with it.
+    """
+    state = SudokuState.from_board(board_copy)
+    forced = []
+    if not state.fill_singles(forced):
+        yield {"type": "failed"}
+        return
+    for i in forced:
+        board_copy[i // 9][i % 9] = state.cells[i]
+        yield {"pos": divmod(i, 9), "val": state.cells[i], "type": "place"}
+
+    stack, nodes = [], 0
+    while True:
+        i = state.mrv_cell()
+        if i is None:
+            yield {"type": "solved", "board": board_copy}
+            return
+        nodes += 1
+        check_budget(nodes, max_nodes)
+        yield {"type": "expand", "pos": divmod(i, 9)}
+        children = VALUES_OF[state.candidates(i)]
+        yield {"type": "enqueue", "pos": divmod(i, 9), "vals": list(children)}
+        stack.append((i, iter(children), []))
+        while stack:
+            i, options, placed = stack[-1]
+            for cell in reversed(placed):
+                state.clear(cell)
+                board_copy[cell // 9][cell % 9] = 0
+                yield {"pos": divmod(cell, 9), "val": 0, "type": "backtrack"}
+            placed.clear()
+            for value in options:
+                state.place(i, value)
+                placed.append(i)
+                if state.fill_singles(placed):
+                    for cell in placed:
+                        board_copy[cell // 9][cell % 9] = state.cells[cell]
+                        yield {"pos": divmod(cell, 9), "val": state.cells[cell], "type": "place"}
+                    break
+                for cell in reversed(placed): state.clear(cell)
+                placed.clear()
+            else:
+                stack.pop()
+                if not stack:
+                    yield {"type": "failed"}
+                    return
+                continue
+            break
+
+def collect_trace(events, start_time):
+    """Drains an event stream into the (solution, steps, ai_time) tuple the routes return."""
+    solution_steps = []
+    for event in events:
+        if event["type"] in TRACE_EVENTS:
+            solution_steps.append(event)
+        elif event["type"] == "solved":
+            elapsed = time.perf_counter() - start_time
+            return (event["board"], solution_steps, f"{elapsed:.12f}")
+    elapsed = time.perf_counter() - start_time
+    return (None, [], f"{elapsed:.12f}")
 
 # --- DFS (Backtracking) Solver ---
-def solve_sudoku_dfs(board):
-    start_time = time.perf_counter()
+def iter_sudoku_dfs(board, max_nodes=None):
     board_copy = [row[:] for row in board]
-    solution_steps = []
+    return _iter_backtracking(board_copy, max_nodes)
 
-    def solve():
-        find = find_empty(board_copy)
-        if not find:
-            return True
-        row, col = find
-
-        for i in range(1, 10):
-            if is_valid(board_copy, row, col, i):
-                board_copy[row][col] = i
-                solution_steps.append({"pos": (row, col), "val": i, "type": "place"})
-                if solve():
-                    return True
-                board_copy[row][col] = 0
-                solution_steps.append({"pos": (row, col), "val": 0, "type": "backtrack"})
-        return False
-
-    if solve():
-        elapsed = time.perf_counter() - start_time
-        return (board_copy, solution_steps, f"{elapsed:.12f}")
-    else:
-        elapsed = time.perf_counter() - start_time
-        return (None, [], f"{elapsed:.12f}")
+def solve_sudoku_dfs(board, max_nodes=None):
+    start_time = time.perf_counter()
+    return collect_trace(iter_sudoku_dfs(board, max_nodes), start_time)
 
 # --- A* Solver ---
-def get_possible_values(board, row, col):
-    if board[row][col] != 0:
-        return []
-    
-    possible = []
-    for num in range(1, 10):
-        if is_valid(board, row, col, num):
-            possible.append(num)
-    return possible
-
-def find_empty_mrv(board):
-    min_len = 10
-    best_pos = None
-    for r in range(9):
-        for c in range(9):
-            if board[r][c] == 0:
-                possible = get_possible_values(board, r, c)
-                if len(possible) < min_len:
-                    min_len = len(possible)
-                    best_pos = (r, c)
-    return best_pos
-
-def solve_sudoku_astar(board):
+def _candidate_total(state):
+    """h: candidates summed over the empty cells, or None if some empty cell has none left."""
+    total = 0
+    for i, value in enumerate(state.cells):
+        if not value:
+            count = state.candidates(i).bit_count()
+            if not count: return None
+            total += count
+    return total
+
+def solve_sudoku_astar(board, max_nodes=None, max_states=200_000):
+    """
+    Best-first search on f = g + h, where g counts placements and h is the number of
+    candidates still open (see _candidate_total), so moves that prune their peers
+    the most come first; ties go to the deeper state. Each stored state is its
+    81-byte board plus a parent index and the placement that made it, and the steps
+    are rebuilt only for the state that solves the board. Children whose board has
+    a dead cell are never stored. Raises SearchBudgetExceeded past `max_nodes`
+    expansions or `max_states` stored states, with the steps to the fullest state.
+    """
     start_time = time.perf_counter()
-    
-    start_board_tuple = tuple(map(tuple, board))
-    g_score = 81 - sum(row.count(0) for row in board)
-    h_score = 81 - g_score
-    f_score = g_score + h_score
-    
-    open_list = [(f_score, g_score, start_board_tuple, [])]
-    visited = {start_board_tuple}
+    start = SudokuState.from_board(board)
+    h = _candidate_total(start)
+    if h is None: return (None, [], f"{time.perf_counter() - start_time:.12f}")
 
-    while open_list:
-        _, g, current_board_tuple, steps = heapq.heappop(open_list)
-        current_board = [list(row) for row in current_board_tuple]
+    keys, parents, moves = [bytes(start.cells)], array('i', [-1]), array('H', [0])
+    visited = {keys[0]}
+    open_list = [(h, 0, 0)]
+    nodes, deepest, deepest_g = 0, 0, 0
+
+    def steps_to(node):
+        steps = []
+        while parents[node] >= 0:
+            cell, val = divmod(moves[node], 10)
+            steps.append({"pos": divmod(cell, 9), "val": val, "type": "place"})
+            node = parents[node]
+        return steps[::-1]
 
-        if g == 81:
+    while open_list:
+        _, _, node = heapq.heappop(open_list)
+        nodes += 1
+        check_budget(nodes, max_nodes, lambda: steps_to(deepest))
+        state = SudokuState(keys[node])
+        i = state.mrv_cell()
+        if i is None:
             elapsed = time.perf_counter() - start_time
-            return (current_board, steps, f"{elapsed:.12f}")
-
-        pos = find_empty_mrv(current_board)
-        if not pos:
-            continue
-        
-        r, c = pos
-        possible_values = get_possible_values(current_board, r, c)
-
-        for val in possible_values:
-            new_board = [row[:] for row in current_board]
-            new_board[r][c] = val
-            new_board_tuple = tuple(map(tuple, new_board))
-
-            if new_board_tuple not in visited:
-                new_g = g + 1
-                new_h = 81 - new_g
-                new_f = new_g + new_h
-                
-                new_steps = steps + [{"pos": (r, c), "val": val, "type": "place"}]
-                heapq.heappush(open_list, (new_f, new_g, new_board_tuple, new_steps))
-                visited.add(new_board_tuple)
+            return (state.board(), steps_to(node), f"{elapsed:.12f}")
+
+        key = keys[node]
+        g = 81 - key.count(0)
+        for val in VALUES_OF[state.candidates(i)]:
+            new_key = key[:i] + bytes((val,)) + key[i + 1:]
+            if new_key in visited: continue
+            visited.add(new_key)
+            state.place(i, val)
+            h = _candidate_total(state)
+            state.clear(i)
+            if h is None: continue
+            child = len(keys)
+            if child >= max_states: raise SearchBudgetExceeded(nodes, steps_to(deepest))
+            keys.append(new_key)
+            parents.append(node)
+            moves.append(i * 10 + val)
+            if g + 1 > deepest_g: deepest, deepest_g = child, g + 1
+            heapq.heappush(open_list, (g + 1 + h, -(g + 1), child))
 
     elapsed = time.perf_counter() - start_time
     return (None, [], f"{elapsed:.12f}")
 
 # --- AC-3 (Constraint Propagation) + Backtracking Solver ---
-def solve_sudoku_ac3(board):
-    start_time = time.perf_counter()
+# Domains are 81 candidate masks. Arc a = (ARC_TAIL[a], ARC_HEAD[a]) says the tail
+# must differ from the head, one arc per ordered pair of peers (81 * 20 = 1620).
+# For "differs from" a revision can only prune once the head is down to one value,
+# so a cell's incoming arcs are requeued only when its domain becomes a singleton.
+ARCS = tuple((i, j) for i in range(81) for j in PEERS[i])
+ARC_TAIL = tuple(i for i, _ in ARCS)
+ARC_HEAD = tuple(j for _, j in ARCS)
+ARCS_INTO = tuple(tuple(k * 20 + PEERS[k].index(j) for k in PEERS[j]) for j in range(81))
+
+def _is_single(mask):
+    return mask & (mask - 1) == 0
+
+def propagate(domains, arcs=range(len(ARCS))):
+    """
+    AC-3 over `domains` (modified in place) from the worklist `arcs`, plus hidden
+    singles: a value with one possible cell left in a unit is fixed there, which
+    feeds more arcs. Naked singles fall out of the arcs themselves. Returns False
+    as soon as a cell or a unit runs out of options.
+    """
+    queue, queued = deque(arcs), bytearray(len(ARCS))
+    for arc in queue: queued[arc] = 1
+    while True:
+        while queue:
+            arc = queue.popleft()
+            queued[arc] = 0
+            tail, head = ARC_TAIL[arc], ARC_HEAD[arc]
+            value = domains[head]
+            if not domains[tail] & value or not _is_single(value): continue
+            domains[tail] &= ~value
+            if not domains[tail]: return False
+            if _is_single(domains[tail]):
+                for arc in ARCS_INTO[tail]:
+                    if not queued[arc]:
+                        queued[arc] = 1
+                        queue.append(arc)
+        for unit in UNITS:
+            once = twice = 0
+            for cell in unit:
+                twice |= once & domains[cell]
+                once |= domains[cell]
+            if once != ALL_VALUES: return False
+            hidden = once & ~twice
+            if not hidden: continue
+            for cell in unit:
+                mask = domains[cell] & hidden
+                if mask and mask != domains[cell]:
+                    if not _is_single(mask): return False
+                    domains[cell] = mask
+                    for arc in ARCS_INTO[cell]:
+                        if not queued[arc]:
+                            queued[arc] = 1
+                            queue.append(arc)
+        if not queue: return True
+
+def _fixed_cells(domains, board_copy, first=None):
+    """Cells whose domain is a single value not yet on the board (`first` leads), written to the board."""
+    cells = [first] if first is not None else []
+    cells += [i for i in range(81) if i != first and not board_copy[i // 9][i % 9] and _is_single(domains[i])]
+    for i in cells:
+        board_copy[i // 9][i % 9] = domains[i].bit_length() - 1
+    return cells
+
+def iter_sudoku_ac3(board, max_nodes=None):
+    """
+    Maintaining arc consistency: AC-3 once over the whole board, then backtracking
+    on the MRV cell with a full propagation after every choice. Cells fixed by
+    propagation are emitted as places right after the choice that forced them and
+    undone with it.
+    """
     board_copy = [row[:] for row in board]
-    solution_steps = []
+    domains = [1 << value if value else ALL_VALUES for row in board_copy for value in row]
+    if not propagate(domains):
+        yield {"type": "failed"}
+        return
+    for i in _fixed_cells(domains, board_copy):
+        yield {"pos": divmod(i, 9), "val": board_copy[i // 9][i % 9], "type": "place"}
 
-    domains = {}
-    for r in range(9):
-        for c in range(9):
-            if board_copy[r][c] == 0:
-                domains[(r, c)] = list(range(1, 10))
+    stack, nodes = [], 0
+    while True:
+        best, best_count = None, 10
+        for i, mask in enumerate(domains):
+            count = mask.bit_count()
+            if 1 < count < best_count:
+                best, best_count = i, count
+                if count == 2: break
+        if best is None:
+            yield {"type": "solved", "board": board_copy}
+            return
+        nodes += 1
+        check_budget(nodes, max_nodes)
+        yield {"type": "expand", "pos": divmod(best, 9)}
+        yield {"type": "enqueue", "pos": divmod(best, 9), "vals": list(VALUES_OF[domains[best]])}
+        stack.append((best, iter(VALUES_OF[domains[best]]), domains, []))
+        while stack:
+            i, options, saved, placed = stack[-1]
+            for cell in reversed(placed):
+                board_copy[cell // 9][cell % 9] = 0
+                yield {"pos": divmod(cell, 9), "val": 0, "type": "backtrack"}
+            placed.clear()
+            for value in options:
+                trial = saved[:]
+                trial[i] = 1 << value
+                if propagate(trial, ARCS_INTO[i]):
+                    domains = trial
+                    placed += _fixed_cells(domains, board_copy, first=i)
+                    for cell in placed:
+                        yield {"pos": divmod(cell, 9), "val": board_copy[cell // 9][cell % 9], "type": "place"}
+                    break
             else:
-                domains[(r, c)] = [board_copy[r][c]]
-
-    def ac3():
-        queue = []
-        for r in range(9):
-            for c in range(9):
-                for c2 in range(9):
-                    if c != c2: queue.append(((r, c), (r, c2)))
-                for r2 in range(9):
-                    if r != r2: queue.append(((r, c), (r2, c)))
-                start_row, start_col = 3 * (r // 3), 3 * (c // 3)
-                for i in range(3):
-                    for j in range(3):
-                        if (r, c) != (start_row + i, start_col + j):
-                            queue.append(((r, c), (start_row + i, start_col + j)))
-        
-        while queue:
-            (xi, xj) = queue.pop(0)
-            if revise(xi, xj):
-                if len(domains[xi]) == 0:
-                    return False
-                r, c = xi
-                for c2 in range(9):
-                    if c != c2: queue.append(((r, c2), xi))
-                for r2 in range(9):
-                    if r != r2: queue.append(((r2, c), xi))
-                start_row, start_col = 3 * (r // 3), 3 * (c // 3)
-                for i in range(3):
-                    for j in range(3):
-                        if (r, c) != (start_row + i, start_col + j):
-                            queue.append(((start_row + i, start_col + j), xi))
-        return True
-
-    def revise(xi, xj):
-        revised = False
-        for x in domains[xi]:
-            if len(domains[xj]) == 1 and x in domains[xj]:
-                domains[xi].remove(x)
-                revised = True
-        return revised
-
-    def solve_with_backtracking():
-        find = find_empty(board_copy)
-        if not find:
-            return True
-        row, col = find
-
-        for value in domains[(row, col)]:
-            if is_valid(board_copy, row, col, value):
-                board_copy[row][col] = value
-                solution_steps.append({"pos": (row, col), "val": value, "type": "place"})
-                if solve_with_backtracking():
-                    return True
-                board_copy[row][col] = 0
-                solution_steps.append({"pos": (row, col), "val": 0, "type": "backtrack"})
-        return False
-
-    if ac3() and solve_with_backtracking():
-        elapsed = time.perf_counter() - start_time
-        return (board_copy, solution_steps, f"{elapsed:.12f}")
-    else:
-        elapsed = time.perf_counter() - start_time
-        return (None, [], f"{elapsed:.12f}")
+                stack.pop()
+                if not stack:
+                    yield {"type": "failed"}
+                    return
+                continue
+            break
+
+def solve_sudoku_ac3(board, max_nodes=None):
+    start_time = time.perf_counter()
+    return collect_trace(iter_sudoku_ac3(board, max_nodes), start_time)
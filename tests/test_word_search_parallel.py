@@ -0,0 +1,55 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_search_solver import DIRECTIONS, solve_word_search_aho, solve_word_search_parallel
+
+def random_puzzle(rows, cols, word_count, seed, alphabet="ABC"):
+    """A small-alphabet grid, so words recur across many lines, with some words planted in random directions."""
+    rng = random.Random(seed)
+    grid = [[rng.choice(alphabet) for _ in range(cols)] for _ in range(rows)]
+    words = sorted({"".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))) for _ in range(word_count)})
+    for word in words[::3]:
+        dr, dc = rng.choice(DIRECTIONS)
+        r_range = range(rows) if dr == 0 else range(rows - len(word) + 1) if dr > 0 else range(len(word) - 1, rows)
+        c_range = range(cols) if dc == 0 else range(cols - len(word) + 1) if dc > 0 else range(len(word) - 1, cols)
+        if not r_range or not c_range: continue
+        r, c = rng.choice(r_range), rng.choice(c_range)
+        for i, char in enumerate(word):
+            grid[r + i * dr][c + i * dc] = char
+    return grid, words + ["ZZZ"]
+
+@pytest.mark.parametrize("processes", [1, 2, 4])
+@pytest.mark.parametrize("rows, cols, seed", [(40, 40, 0), (17, 53, 1), (61, 9, 2)])
+def test_parallel_matches_serial(processes, rows, cols, seed):
+    grid, words = random_puzzle(rows, cols, 60, seed)
+    expected, _ = solve_word_search_aho(grid, words)
+    found, _ = solve_word_search_parallel(grid, words, processes=processes, min_cells=0)
+    assert found == expected
+
+@pytest.mark.parametrize("processes", [1, 2, 4])
+@pytest.mark.parametrize("chunks_per_process", [1, 3, 1000])
+def test_chunk_boundaries_keep_first_occurrence(processes, chunks_per_process):
+    # "AB" occurs on almost every line, so its first occurrence must win the merge
+    # whichever chunk finds it; 1000 chunks per process makes every chunk one line.
+    grid = [["A", "B"] * 6 for _ in range(13)]
+    words = ["AB", "BA", "ABAB", "BB"]
+    expected, _ = solve_word_search_aho(grid, words)
+    found, _ = solve_word_search_parallel(grid, words, processes=processes, chunks_per_process=chunks_per_process, min_cells=0)
+    assert found == expected
+
+@pytest.mark.parametrize("processes", [1, 2, 4])
+@pytest.mark.parametrize("grid", [[["A"]], [list("CAT")], [["C"], ["A"], ["T"]], [list("TA"), list("AC")]])
+def test_small_grids(processes, grid):
+    words = ["A", "CAT", "TAC", "AT", "DOG"]
+    expected, _ = solve_word_search_aho(grid, words)
+    for min_cells in (0, 40_000):
+        found, _ = solve_word_search_parallel(grid, words, processes=processes, min_cells=min_cells)
+        assert found == expected
+
+def test_empty_grid():
+    assert solve_word_search_parallel([], ["A"], processes=2, min_cells=0)[0] == {}
@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict
+
+from progress_store import parse_level_key
+
+def make_history_item(level_key, data, game_names):
+    parsed = parse_level_key(level_key)
+    if not parsed: return None
+    game, diff, level = parsed
+    return {
+        "game": game_names.get(game, game.replace('_', ' ').title()),
+        "level": f"{diff.title()} {level}", "difficulty": diff,
+        "is_won": not ('status' in data and data['status'] != 'won')
+    }
+
+class HistoryCache:
+    """
+    Per-worker cache of each user's profile-panel history.
+    Entries are built once from the progress store and then patched in place by
+    record()/forget() as this worker writes progress. Writes made by other workers
+    become visible once an entry is older than `ttl` seconds.
+    """
+
+    def __init__(self, store, game_names, ttl=30, max_users=1024):
+        self.store = store
+        self.game_names = game_names
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _build(self, email):
+        items = {}
+        for level_key, data in self.store.get_user(email).items():
+            item = make_history_item(level_key, data, self.game_names)
+            if item: items[level_key] = item
+        return {"items": items, "sorted": None, "loaded_at": time.monotonic()}
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is not None and time.monotonic() - entry["loaded_at"] <= self.ttl:
+                self._entries.move_to_end(email)
+                if entry["sorted"] is None:
+                    entry["sorted"] = sorted(entry["items"].values(), key=lambda item: item['game'])
+                return entry["sorted"]
+        entry = self._build(email)
+        entry["sorted"] = sorted(entry["items"].values(), key=lambda item: item['game'])
+        with self._lock:
+            self._entries[email] = entry
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_users: self._entries.popitem(last=False)
+        return entry["sorted"]
+
+    def record(self, email, level_key, data):
+        """Applies one progress write to a cached entry (no-op if the user isn't cached)."""
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None: return
+            item = make_history_item(level_key, data, self.game_names)
+            if item:
+                entry["items"][level_key] = item
+                entry["sorted"] = None
+
+    def forget(self, email, level_key=None):
+        with self._lock:
+            if level_key is None:
+                self._entries.pop(email, None)
+                return
+            entry = self._entries.get(email)
+            if entry is not None and entry["items"].pop(level_key, None) is not None:
+                entry["sorted"] = None
+
+class LazyHistory:
+    """Defers the history lookup until a template actually reads it."""
+
+    def __init__(self, cache, email):
+        self._cache, self._email, self._items = cache, email, None
+
+    def _load(self):
+        if self._items is None: self._items = self._cache.get(self._email)
+        return self._items
+
+    def __iter__(self): return iter(self._load())
+    def __len__(self): return len(self._load())
+    def __bool__(self): return bool(self._load())
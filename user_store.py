@@ -0,0 +1,122 @@
+import fcntl
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+class UserRepository:
+    """
+    users.json loaded once and indexed by lowercased email and username.
+    Lookups are dict hits; the file is reloaded only when its mtime/size changes
+    (another worker wrote it). Writes hold an flock on `<file>.lock` across
+    reload, modify and persist, so concurrent workers never lose each other's
+    updates, and replace the file atomically from a unique temp file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._signature = None
+        self._users = []
+        self._by_email = {}
+        self._by_username = {}
+
+    @staticmethod
+    def _key(value):
+        return (value or "").strip().lower()
+
+    def _current_signature(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _index(self, users):
+        self._users = users
+        self._by_email = {self._key(u.get('email')): u for u in users}
+        self._by_username = {self._key(u.get('username')): u for u in users if u.get('username')}
+
+    def _refresh(self):
+        signature = self._current_signature()
+        if signature == self._signature and signature is not None: return
+        with self._lock:
+            signature = self._current_signature()
+            if signature == self._signature and signature is not None: return
+            users = []
+            if signature is not None:
+                try:
+                    with open(self.file_path, 'r', encoding='utf-8') as f: users = json.load(f)
+                except (json.JSONDecodeError, OSError): users = []
+            self._index(users if isinstance(users, list) else [])
+            self._signature = signature
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive across threads and processes; re-entrant within the holding thread."""
+        with self._lock:
+            if self._lock_file is not None:
+                yield
+                return
+            with open(f"{self.file_path}.lock", "a") as self._lock_file:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file = None
+
+    def _persist(self):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.file_path)), prefix=".users-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding='utf-8') as f: json.dump(self._users, f, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._signature = self._current_signature()
+
+    def all(self):
+        self._refresh()
+        return list(self._users)
+
+    def by_email(self):
+        """Returns {email: user} keyed by the stored (original-case) email."""
+        self._refresh()
+        return {u['email']: u for u in self._users}
+
+    def get(self, email):
+        self._refresh()
+        return self._by_email.get(self._key(email))
+
+    def get_by_username(self, username):
+        self._refresh()
+        return self._by_username.get(self._key(username))
+
+    def authenticate(self, email, password):
+        user = self.get(email)
+        return user if user and user.get("password") == password else None
+
+    def update(self, email, **fields):
+        """Updates one user record in place and persists; returns the updated user or None."""
+        with self._write_lock():
+            self._refresh()
+            user = self._by_email.get(self._key(email))
+            if user is None: return None
+            if 'username' in fields:
+                self._by_username.pop(self._key(user.get('username')), None)
+            user.update(fields)
+            if user.get('username'): self._by_username[self._key(user['username'])] = user
+            self._persist()
+            return user
+
+    def delete(self, email):
+        with self._write_lock():
+            self._refresh()
+            user = self._by_email.get(self._key(email))
+            if user is None: return False
+            self._index([u for u in self._users if u is not user])
+            self._persist()
+            return True
@@ -1,40 +1,85 @@
+import multiprocessing
+import os
+import threading
 import time
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
 
-# --- Simple Backtracking/DFS Solver ---
+# --- Grid Preprocessing ---
+# Every solver scans in this direction order; a word found more than once keeps its
+# first occurrence by start cell (row-major), then direction.
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+class GridIndex:
+    """
+    A grid preprocessed once for searching: `flat` is the row-major string of its
+    letters, `positions` maps each letter to its flat indexes (ascending), and
+    `lines[d]` is (text, offsets, starts): every line of direction d joined by
+    newlines, where the line beginning at text offset offsets[k] starts at cell
+    starts[k]. str.find on a line text finds a word along that direction in C.
+    """
+    __slots__ = ("rows", "cols", "flat", "positions", "lines")
+
+    def __init__(self, flat, rows, cols):
+        self.rows, self.cols, self.flat = rows, cols, flat
+        self.positions = {}
+        for i, letter in enumerate(flat):
+            self.positions.setdefault(letter, []).append(i)
+        self.lines = []
+        for dr, dc in DIRECTIONS:
+            parts, offsets, starts, offset = [], [], [], 0
+            for r in range(rows):
+                for c in range(cols):
+                    if 0 <= r - dr < rows and 0 <= c - dc < cols: continue
+                    length = min(rows - r if dr > 0 else r + 1 if dr < 0 else cols,
+                                 cols - c if dc > 0 else c + 1 if dc < 0 else rows)
+                    parts.append("".join(flat[(r + i * dr) * cols + c + i * dc] for i in range(length)))
+                    offsets.append(offset)
+                    starts.append((r, c))
+                    offset += length + 1
+            self.lines.append(("\n".join(parts), offsets, starts))
+
+    def find_all(self, word, d):
+        """Start cells of every occurrence of `word` running in direction d."""
+        text, offsets, starts = self.lines[d]
+        dr, dc = DIRECTIONS[d]
+        i = text.find(word)
+        while i >= 0:
+            k = bisect_right(offsets, i) - 1
+            (r, c), step = starts[k], i - offsets[k]
+            yield (r + step * dr, c + step * dc)
+            i = text.find(word, i + 1)
+
+@lru_cache(maxsize=32)
+def _grid_index(flat, rows, cols):
+    return GridIndex(flat, rows, cols)
+
+def grid_index(grid):
+    """The GridIndex for a grid of one-letter cells, cached by content so each level is preprocessed once."""
+    return _grid_index("".join("".join(row) for row in grid), len(grid), len(grid[0]))
+
+# --- Simple Indexed Line-Scan Solver ---
 def solve_word_search_simple(grid, words):
     """
-    Finds all words in the grid using a simple search algorithm.
-    This is effectively a backtracking/DFS approach.
+    Finds each word with str.find over the grid's line strings in all 8 directions.
+    A word whose first or last letter is not in the grid is skipped without a search.
     """
     start_time = time.perf_counter()
     found_words = {}
-    rows, cols = len(grid), len(grid[0])
-    word_set = set(words)
+    if grid and grid[0]:
+        index = grid_index(grid)
+        for word in set(words):
+            if not word or word[0] not in index.positions or word[-1] not in index.positions: continue
+            best = min(((r, c, d) for d in range(len(DIRECTIONS)) for r, c in index.find_all(word, d)), default=None)
+            if best:
+                r, c, d = best
+                dr, dc = DIRECTIONS[d]
+                found_words[word] = [(r + i * dr, c + i * dc) for i in range(len(word))]
 
-    for word in word_set:
-        if word in found_words:
-            continue
-        for r in range(rows):
-            for c in range(cols):
-                # Search in all 8 directions from (r, c)
-                for dr, dc in [(0,1), (1,0), (0,-1), (-1,0), (1,1), (1,-1), (-1,1), (-1,-1)]:
-                    path = []
-                    match = True
-                    for i in range(len(word)):
-                        nr, nc = r + i * dr, c + i * dc
-                        if not (0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == word[i]):
-                            match = False
-                            break
-                        path.append((nr, nc))
-                    
-                    if match:
-                        found_words[word] = path
-                        break # Move to the next word
-            if word in found_words:
-                break # Move to the next word
-    
     elapsed = time.perf_counter() - start_time
     return (found_words, f"{elapsed:.12f}")
+
 # --- Advanced Trie-based Solver (Corrected) ---
 class TrieNode:
     def __init__(self):
@@ -56,47 +101,171 @@ def build_trie(words):
 
 def solve_word_search_trie(grid, words):
     """
-    Finds all words using a more efficient and corrected Trie-based search.
+    Walks the trie along each direction from the cells whose letter starts some
+    word (taken from the grid index, in row-major order), reading the flat grid.
     """
     start_time = time.perf_counter()
     root = build_trie(words)
     found_words = {}
-    rows, cols = len(grid), len(grid[0])
     word_set = set(words)
+    if grid and grid[0]:
+        index = grid_index(grid)
+        flat, rows, cols = index.flat, index.rows, index.cols
+        starts = sorted(p for letter in root.children for p in index.positions.get(letter, ()))
+        for p in starts:
+            # Early exit if all words are found
+            if len(found_words) == len(word_set): break
+            r, c = divmod(p, cols)
+            for dr, dc in DIRECTIONS:
+                node, rr, cc, depth = root, r, c, 0
+                while 0 <= rr < rows and 0 <= cc < cols:
+                    node = node.children.get(flat[rr * cols + cc])
+                    if node is None: break
+                    depth += 1
+                    if node.is_end_of_word and node.word not in found_words:
+                        found_words[node.word] = [(r + i * dr, c + i * dc) for i in range(depth)]
+                    rr, cc = rr + dr, cc + dc
 
-    def _search_in_direction(r, c, dr, dc, node, path):
-        """Searches recursively in a single direction."""
-        # Boundary check
-        if not (0 <= r < rows and 0 <= c < cols):
-            return
+    elapsed = time.perf_counter() - start_time
+    return (found_words, f"{elapsed:.12f}")
 
-        char = grid[r][c]
-        if char not in node.children:
-            return
+# --- Aho-Corasick Line Scan Solver ---
 
-        # Move to the next node in the trie
-        node = node.children[char]
-        new_path = path + [(r, c)]
+class AhoCorasick:
+    """
+    Automaton over a word list: `goto[state]` maps a letter to the next state, `fail`
+    is the longest proper suffix that is also a state, and `out[state]` holds the
+    indexes of every word ending there (its own plus those along its failure chain).
+    """
 
-        if node.is_end_of_word:
-            # Use setdefault to store the first path found for a word
-            found_words.setdefault(node.word, new_path)
+    def __init__(self, words):
+        self.words = tuple(words)
+        self.lengths = tuple(len(word) for word in self.words)
+        goto, fail, out = [{}], [0], [[]]
+        for index, word in enumerate(self.words):
+            state = 0
+            for char in word:
+                if char not in goto[state]:
+                    goto[state][char] = len(goto)
+                    goto.append({}); fail.append(0); out.append([])
+                state = goto[state][char]
+            out[state].append(index)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                queue.append(child)
+                suffix = fail[state]
+                while suffix and char not in goto[suffix]:
+                    suffix = fail[suffix]
+                fail[child] = goto[suffix].get(char, 0) if state else 0
+                out[child] += out[fail[child]]
+        self.goto, self.fail, self.out = goto, fail, [tuple(o) for o in out]
 
-        # Continue searching in the same direction
-        _search_in_direction(r + dr, c + dc, dr, dc, node, new_path)
+@lru_cache(maxsize=64)
+def build_automaton(words):
+    """One automaton per distinct word list (pass a tuple), built on first use."""
+    return AhoCorasick(words)
 
+def grid_lines(rows, cols):
+    """
+    Every line of the grid as (direction, start_r, start_c), direction by direction:
+    a line starts at each cell whose predecessor in that direction is off the grid.
+    """
+    return [(d, r, c) for d, (dr, dc) in enumerate(DIRECTIONS) for r in range(rows) for c in range(cols)
+            if not (0 <= r - dr < rows and 0 <= c - dc < cols)]
 
-    # Main loop to start the search from every cell
-    for r in range(rows):
-        # Early exit if all words are found
-        if len(found_words) == len(word_set):
-            break
-        for c in range(cols):
-            if len(found_words) == len(word_set):
-                break
-            # From each cell (r, c), start a new search in all 8 directions
-            for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                _search_in_direction(r, c, dr, dc, root, [])
+def scan_lines(grid, automaton, lines, best=None):
+    """
+    Streams each of `lines` (see grid_lines) through the automaton once, keeping per
+    word index the first (start_r, start_c, direction) it occurs at.
+    """
+    best = {} if best is None else best
+    rows, cols = len(grid), len(grid[0])
+    goto, fail, out, lengths = automaton.goto, automaton.fail, automaton.out, automaton.lengths
+    for d, r, c in lines:
+        dr, dc = DIRECTIONS[d]
+        state = 0
+        while 0 <= r < rows and 0 <= c < cols:
+            char = grid[r][c]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                back = lengths[index] - 1
+                start = (r - back * dr, c - back * dc, d)
+                if index not in best or start < best[index]: best[index] = start
+            r, c = r + dr, c + dc
+    return best
+
+def _paths(automaton, best):
+    found = {}
+    for index in sorted(best):
+        r, c, d = best[index]
+        dr, dc = DIRECTIONS[d]
+        found[automaton.words[index]] = [(r + i * dr, c + i * dc) for i in range(automaton.lengths[index])]
+    return found
+
+def solve_word_search_aho(grid, words):
+    """
+    Finds all words by running every row, column and diagonal, in both directions,
+    through an Aho-Corasick automaton of the word list: time is linear in the grid
+    size plus the matches, however many words there are.
+    """
+    start_time = time.perf_counter()
+    found_words = {}
+    if grid and grid[0]:
+        automaton = build_automaton(tuple(sorted({word for word in words if word})))
+        found_words = _paths(automaton, scan_lines(grid, automaton, grid_lines(len(grid), len(grid[0]))))
+    elapsed = time.perf_counter() - start_time
+    return (found_words, f"{elapsed:.12f}")
+
+# --- Parallel Line Scan ---
+# The grid, automaton and line list are parked in a module global just before the
+# pool forks, so workers inherit them copy-on-write; a task is only a (lo, hi)
+# slice of the line list and a result only the first start per word found.
+_fork_shared = None
+_fork_lock = threading.Lock()
+
+def _scan_chunk(bounds):
+    grid, automaton, lines = _fork_shared
+    return scan_lines(grid, automaton, lines[bounds[0]:bounds[1]])
+
+def solve_word_search_parallel(grid, words, processes=None, chunks_per_process=4, min_cells=40_000):
+    """
+    solve_word_search_aho with the grid lines split into chunks searched by a
+    forked process pool, merged into the same result. Grids under `min_cells`
+    cells, a single process, or a caller that is itself a daemon process (such
+    as a SolverService worker, which may not fork children) scan serially.
 
+    Limits: this is a library/benchmark API only, not a registered solver, since
+    the app's solves run in daemon SolverService workers. Results are tested to
+    equal the serial scan, but its speedup over processes has not been measured
+    on a multi-core machine (see benchmarks/word_search_benchmark.py); on one
+    core it is no faster than solve_word_search_aho.
+    """
+    global _fork_shared
+    start_time = time.perf_counter()
+    found_words = {}
+    if grid and grid[0]:
+        rows, cols = len(grid), len(grid[0])
+        processes = processes or os.cpu_count() or 1
+        automaton = build_automaton(tuple(sorted({word for word in words if word})))
+        lines = grid_lines(rows, cols)
+        if processes == 1 or rows * cols < min_cells or multiprocessing.current_process().daemon:
+            best = scan_lines(grid, automaton, lines)
+        else:
+            step = -(-len(lines) // (processes * chunks_per_process))
+            best = {}
+            with _fork_lock:
+                _fork_shared = (grid, automaton, lines)
+                try:
+                    with multiprocessing.get_context("fork").Pool(processes) as pool:
+                        for part in pool.imap_unordered(_scan_chunk, [(lo, lo + step) for lo in range(0, len(lines), step)]):
+                            for index, start in part.items():
+                                if index not in best or start < best[index]: best[index] = start
+                finally:
+                    _fork_shared = None
+        found_words = _paths(automaton, best)
     elapsed = time.perf_counter() - start_time
-    return (found_words, f"{elapsed:.12f}")
\ No newline at end of file
+    return (found_words, f"{elapsed:.12f}")